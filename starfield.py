@@ -1,15 +1,43 @@
 #!/usr/bin/env python3
-import curses, random, time, math, json, locale, argparse, os
-from collections import deque, namedtuple
-locale.setlocale(locale.LC_ALL, '')
+import time
+STARTUP_T0 = time.perf_counter()   # --startup-trace measures from here
+import curses, random, math, json, locale, argparse, os, sys, unicodedata, tracemalloc, bisect, heapq, itertools, queue, threading, struct, statistics, asyncio, zlib, stat
+from collections import deque, namedtuple, OrderedDict
+import concurrent.futures   # the process pool (batch, aggregate) is only imported when used
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+try:
+    import termios, tty, select
+except ImportError:  # Windows: the ANSI backend reads keys through msvcrt instead
+    termios = None
+np = None   # NumPy once load_numpy() has run; optional: without it the per-object Star engine is used
+_NUMPY_MISSING = False
+def load_numpy():
+    """Import NumPy on first use (None if it is not installed): it costs more than the rest of startup."""
+    global np, _NUMPY_MISSING
+    if np is None and not _NUMPY_MISSING:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            _NUMPY_MISSING = True
+    return np
 # Configuration / Limits
 DEFAULT_SPEED = 1.0        # movement visual speed (not warp multiplier)
 MIN_SPEED = 0.3
 MAX_SPEED = 4.0
 VISUAL_SPEED_CAP = 2.0     # cap for smooth star visuals
-FPS = 28.0
+FPS = 28.0                 # render rate target
+SIM_HZ = 56.0              # fixed simulation tick rate
+INPUT_POLL_HZ = 250.0      # key polling rate where stdin cannot be watched by the event loop (Windows)
+ESC_DELAY = 0.025          # --backend ansi: wait this long for the rest of an escape sequence before ESC quits
 Z_MAX = 8.0
 STAR_DENSITY = 160
+LOD_MIN = 0.1              # adaptive detail never drops below this fraction of --density
+LOD_HIGH, LOD_LOW = 0.85, 0.45   # busy fraction of the frame that steps detail down / up
+LOD_HOLD_DOWN, LOD_HOLD_UP = 0.5, 1.0   # seconds to wait after a step before the next one
+LOD_PULSE_MIN = 0.5        # below this detail level power packs stop pulsing
+PERF_OVERLAY_HZ = 4.0      # frame-time overlay refreshes per second at full detail
 POWER_SPAWN_CHANCE = 0.0015
 POWER_LIFE = 12.0
 POWER_COLLECT_RADIUS = 2
@@ -20,7 +48,16 @@ FUEL_CONSUMPTION_MOVE = 0.08    # per second
 FUEL_CONSUMPTION_SCAN = 5.0
 FUEL_CONSUMPTION_PICK = 2.0
 TASK_REWARD_BASE = 200
+FUEL_SNAPSHOT_EVERY = 5.0   # seconds of sim time between fuel snapshots in the event log
 SCAN_RADIUS = 3.0
+UNIVERSE_CACHE = 8          # generated galaxies kept in memory (least recently used dropped)
+SECTOR_CHUNK_W, SECTOR_CHUNK_H = 32, 16   # sector map chunk size in cells
+SECTOR_KEEP = 2             # chunks kept loaded beyond the viewport before eviction
+SCROLL_MARGIN_X, SCROLL_MARGIN_Y = 10, 4  # ship distance from the view edge that scrolls the camera
+SPECTATOR_SOCKET = "voyager.sock"   # --broadcast / --spectate default socket path
+SPECTATOR_QUEUE = 8         # frames queued per spectator before it is resynced with a full frame
+SNAP_PATH = "voyage_snapshot.bin"   # session snapshot for --resume
+SNAP_EVERY = 30.0           # seconds between autosaves while playing (--autosave)
 GALAXY_DB = {
     "Andromeda": {
         "type": "Spiral", "distance": "2.5 Mly", "faction": "Andromedan Union",
@@ -59,61 +96,210 @@ PLANET_ARTS = [
 # Classes / Objects
 class Star:
     __slots__ = ("x","y","z","ch","col")
-    def __init__(self,w,h): self.reset(w,h,init=True)
-    def reset(self,w,h,init=False):
-        self.x = (random.random()-0.5)*w
-        self.y = (random.random()-0.5)*h
-        self.z = random.uniform(0.5, Z_MAX) if init else Z_MAX
+    def __init__(self,w,h,rng=random): self.reset(w,h,init=True,rng=rng)
+    def reset(self,w,h,init=False,rng=random):
+        self.x = (rng.random()-0.5)*w
+        self.y = (rng.random()-0.5)*h
+        self.z = rng.uniform(0.5, Z_MAX) if init else Z_MAX
         self.update()
     def update(self):
         depth = self.z / Z_MAX
         if depth < 0.3: self.ch, self.col = "✦", 3
         elif depth < 0.6: self.ch, self.col = "+", 2
         else: self.ch, self.col = ".", 1
-    def step(self, visual_speed, dt):
-        self.x += math.sin(time.time()*0.3 + self.z)*0.08*dt
+    def step(self, visual_speed, dt, t=None):
+        if t is None: t = time.time()
+        self.x += math.sin(t*0.3 + self.z)*0.08*dt
         # move based on visual speed (clamped)
         self.z -= dt * max(0.15, visual_speed / (1 + self.z*0.12))
         self.update()
         return self.z > 0.1
+# depth buckets used by Star.update(): near, mid, far
+STAR_GLYPHS = ("✦", "+", ".")
+STAR_COLS = (3, 2, 1)
+GLYPH_BUCKET = {g: i for i, g in enumerate(STAR_GLYPHS)}
+# Braille mode: each cell is a 2x4 dot grid; dot bit for sub-pixel (column*4 + row) of a cell
+BRAILLE_BITS = (0x01, 0x02, 0x04, 0x40, 0x08, 0x10, 0x20, 0x80)
+class ScalarStarField:
+    """Per-object engine: a plain list of Star objects stepped one by one."""
+    def __init__(self, n, w, h, rng=random):
+        self.rng = rng
+        self.stars = [Star(w,h,rng) for _ in range(n)]
+        self.active = n     # only the first `active` stars are stepped and drawn
+    def __len__(self): return len(self.stars)
+    def set_active(self, n):
+        self.active = max(1, min(len(self.stars), n))
+    def step(self, visual_speed, dt, w, h, t):
+        for s in itertools.islice(self.stars, self.active):
+            if not s.step(visual_speed, dt, t):
+                s.reset(w,h, False, self.rng)
+    def project(self, w, h, alpha=1.0):
+        # per-object stars keep no previous position, so alpha is ignored here
+        cx, cy = w//2, h//2
+        kx, ky = min(w,h)/2, min(w,h)/4
+        for s in itertools.islice(self.stars, self.active):
+            sx = int(cx + (s.x / s.z) * kx)
+            sy = int(cy + (s.y / s.z) * ky)
+            if 0 <= sx < w and 0 <= sy < h:
+                yield sx, sy, s.ch, s.col
+    def raster(self, w, h, alpha=1.0):
+        # Braille dots: (cell index y*w+x, dot bits, nearest depth bucket) of occupied cells
+        cx, cy = w//2, h//2
+        kx, ky = min(w,h)/2, min(w,h)/4
+        dots, near = {}, {}
+        floor = math.floor
+        for s in itertools.islice(self.stars, self.active):
+            dx = floor((cx + (s.x / s.z) * kx) * 2)
+            dy = floor((cy + (s.y / s.z) * ky) * 4)
+            if 0 <= dx < 2*w and 0 <= dy < 4*h:
+                cell = (dy >> 2)*w + (dx >> 1)
+                dots[cell] = dots.get(cell, 0) | BRAILLE_BITS[(dx & 1)*4 + (dy & 3)]
+                b = GLYPH_BUCKET[s.ch]
+                if b < near.get(cell, 3): near[cell] = b
+        cells = sorted(dots)
+        return cells, [dots[c] for c in cells], [near[c] for c in cells]
+class StarField:
+    """
+    Struct-of-arrays engine: x/y/z and the depth bucket of every star live in
+    contiguous NumPy arrays, so stepping, respawning, depth classification and
+    projection are a handful of batched operations per frame.
+    """
+    __slots__ = ("x","y","z","px","pz","bucket","rng","active")
+    _glyphs = _cols = _dot_bits = None   # lookup tables, built with the first field (NumPy loads lazily)
+    def __init__(self, n, w, h, seed=None):
+        if StarField._glyphs is None:
+            StarField._glyphs, StarField._cols = np.array(STAR_GLYPHS), np.array(STAR_COLS)
+            StarField._dot_bits = np.array(BRAILLE_BITS, dtype=np.uint8)
+        # without an explicit seed, tie the NumPy stream to the global random state
+        self.rng = np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+        self.x = (self.rng.random(n)-0.5)*w
+        self.y = (self.rng.random(n)-0.5)*h
+        self.z = self.rng.uniform(0.5, Z_MAX, n)
+        self.px, self.pz = self.x.copy(), self.z.copy()   # previous tick, for interpolation
+        self.bucket = np.empty(n, dtype=np.int8)
+        self.active = n     # stars past `active` are dormant: not stepped, not drawn
+        self.update()
+    def __len__(self): return len(self.z)
+    def set_active(self, n):
+        n = max(1, min(len(self.z), n))
+        if n > self.active:
+            # woken stars resume where they froze, without an interpolation streak
+            self.px[self.active:n] = self.x[self.active:n]
+            self.pz[self.active:n] = self.z[self.active:n]
+        self.active = n
+    def update(self):
+        depth = self.z[:self.active] / Z_MAX
+        self.bucket[:self.active] = (depth >= 0.3).astype(np.int8) + (depth >= 0.6)
+    def step(self, visual_speed, dt, w, h, t):
+        a = self.active
+        x, y, z = self.x[:a], self.y[:a], self.z[:a]   # views: updates land in the full arrays
+        self.px[:a] = x
+        self.pz[:a] = z
+        x += np.sin(t*0.3 + z) * (0.08*dt)
+        z -= dt * np.maximum(0.15, visual_speed / (1 + z*0.12))
+        dead = z <= 0.1
+        n = int(np.count_nonzero(dead))
+        if n:
+            # same respawn as Star.reset(w,h,False): fresh x/y at the far plane
+            x[dead] = (self.rng.random(n)-0.5)*w
+            y[dead] = (self.rng.random(n)-0.5)*h
+            z[dead] = Z_MAX
+            # respawned stars must not streak across the screen when interpolated
+            self.px[:a][dead] = x[dead]
+            self.pz[:a][dead] = Z_MAX
+        self.update()
+    def screen(self, w, h, alpha=1.0):
+        # fractional screen columns/rows of the active stars;
+        # alpha in [0,1] blends from the previous tick's positions to the current ones
+        a = self.active
+        if alpha >= 1.0:
+            x, z = self.x[:a], self.z[:a]
+        else:
+            x = self.px[:a] + (self.x[:a] - self.px[:a]) * alpha
+            z = self.pz[:a] + (self.z[:a] - self.pz[:a]) * alpha
+        k = min(w,h)
+        return w//2 + (x / z) * (k/2), h//2 + (self.y[:a] / z) * (k/4)
+    def project(self, w, h, alpha=1.0):
+        fx, fy = self.screen(w, h, alpha)
+        sx, sy = fx.astype(np.int64), fy.astype(np.int64)
+        vis = (sx >= 0) & (sx < w) & (sy >= 0) & (sy < h)
+        b = self.bucket[:self.active][vis]
+        return zip(sx[vis].tolist(), sy[vis].tolist(), self._glyphs[b].tolist(), self._cols[b].tolist())
+    def raster(self, w, h, alpha=1.0):
+        # Braille dots: (cell index y*w+x, dot bits, nearest depth bucket) of occupied cells
+        fx, fy = self.screen(w, h, alpha)
+        dx = np.floor(fx * 2).astype(np.int64)
+        dy = np.floor(fy * 4).astype(np.int64)
+        vis = (dx >= 0) & (dx < 2*w) & (dy >= 0) & (dy < 4*h)
+        dx, dy = dx[vis], dy[vis]
+        cell = (dy >> 2)*w + (dx >> 1)
+        dots = np.zeros(w*h, dtype=np.uint8)
+        np.bitwise_or.at(dots, cell, self._dot_bits[(dx & 1)*4 + (dy & 3)])
+        near = np.full(w*h, 3, dtype=np.int8)
+        np.minimum.at(near, cell, self.bucket[:self.active][vis])
+        occ = np.flatnonzero(dots)
+        return occ.tolist(), dots[occ].tolist(), near[occ].tolist()
+def make_starfield(n, w, h, engine="auto", rng=random):
+    if engine == "python" or load_numpy() is None:
+        return ScalarStarField(n, w, h, rng)
+    return StarField(n, w, h, rng.getrandbits(64))
+SPRITE_Z_MIN = 0.12
 class GalaxySprite:
-    __slots__ = ("name","art","x","y","z","w","h")
-    def __init__(self,name,art,w,h):
-        self.name=name; self.art=art; self.w=w; self.h=h; self.reset()
-    def reset(self):
-        self.x = (random.random()-0.5)*self.w*0.6
-        self.y = (random.random()-0.5)*self.h*0.6
-        self.z = Z_MAX
-    def step(self, visual_speed, dt):
-        self.z -= dt * visual_speed * 0.22
-        return self.z > 0.12
+    # depth is not stepped per sprite: all sprites share the sim's sprite odometer, and a
+    # sprite's z is Z_MAX minus the distance travelled since it spawned (odometer d0)
+    __slots__ = ("name","art","x","y","d0","w","h")
+    def __init__(self,name,art,w,h,d0=0.0,rng=random):
+        self.name=name; self.art=art; self.w=w; self.h=h; self.d0=d0; self.reset(rng)
+    def reset(self, rng=random):
+        self.x = (rng.random()-0.5)*self.w*0.6
+        self.y = (rng.random()-0.5)*self.h*0.6
+    def z(self, odometer):
+        return Z_MAX - (odometer - self.d0)
 
 class PowerPack:
     __slots__ = ("x","y","t0")
-    def __init__(self,x,y):
-        self.x=x; self.y=y; self.t0=time.time()
+    def __init__(self,x,y,t0=None):
+        self.x=x; self.y=y; self.t0=time.time() if t0 is None else t0
 # For mission modeling
 Planet = namedtuple("Planet", ["name","type","atmos","life","desc","art"])
-StarSystem = namedtuple("StarSystem", ["name","x","y","planets","history","threat"])
+# u,v: world position in [0,1); x,y: screen cell for the current terminal (see place_system)
+StarSystem = namedtuple("StarSystem", ["name","u","v","planets","history","threat","x","y"], defaults=(0, 0))
+Galaxy = namedtuple("Galaxy", ["name","seed","systems"])
 # Utility drawing helpers
+_PAIR_ATTRS = {}
+def pair_attr(col):
+    """curses.color_pair() memoized per pair; falls back to the ncurses encoding before initscr()."""
+    a = _PAIR_ATTRS.get(col)
+    if a is None:
+        try:
+            a = curses.color_pair(col)
+        except curses.error:
+            a = col << 8   # before initscr (ANSI/null backends): ncurses' own encoding
+        _PAIR_ATTRS[col] = a
+    return a
 def safe_addstr(win, y, x, s, col=0, attr=0):
     """
     Safe add string with optional color pair index and curses attributes (like A_BOLD, A_BLINK).
-    Backwards-compatible: existing callers passing col still work.
+    Backwards-compatible: existing callers passing col still work. Clipping is by display
+    width (wide glyphs take two cells) through the clip_cells() cache.
     """
-    try:
-        maxy, maxx = win.getmaxyx()
-        if y < 0 or y >= maxy: return
-        if x >= maxx: return
-        if x < 0:
-            s = s[-x:]
-            x = 0
-        if x + len(s) > maxx:
-            s = s[:maxx - x]
-        attr_mask = curses.color_pair(col) | (attr or 0)
-        win.addstr(y, x, s, attr_mask)
-    except Exception:
+    maxy, maxx = win.getmaxyx()
+    if y < 0 or y >= maxy or x >= maxx: return
+    if x < 0:
+        cells = clip_cells(s, maxx, -x)
+        x = 0
+    else:
+        cells = clip_cells(s, maxx - x)
+    if not cells: return
+    attr_mask = pair_attr(col) | (attr or 0)
+    add = getattr(win, "addcells", None)
+    if add:
+        add(y, x, cells, attr_mask)
         return
+    try:
+        win.addstr(y, x, "".join(cells), attr_mask)
+    except curses.error:
+        pass   # the bottom-right cell of a curses window always raises after writing
 def draw_box(win, top, left, w, h, title=None, col=2):
     if w < 4 or h < 3: return
     safe_addstr(win, top, left, "┌" + "─"*(w-2) + "┐", col)
@@ -123,44 +309,250 @@ def draw_box(win, top, left, w, h, title=None, col=2):
     if title:
         safe_addstr(win, top, left+2, f"[ {title} ]", col)
 
+# Frame buffer: each frame is composed in memory and only changed cells are pushed
+def cell_width(ch):
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+def _cells(s):
+    # one entry per screen cell; a wide glyph is followed by an empty continuation cell
+    if s.isascii(): return s
+    out = []
+    for ch in s:
+        out.append(ch)
+        if cell_width(ch) == 2: out.append("")
+    return out
+CLIP_CACHE_MAX = 4096   # memoized clips kept before the cache is emptied
+_CLIPS = {}
+def clip_cells(s, room, skip=0):
+    """
+    `s` as screen cells with the first `skip` cells dropped and at most `room` kept; a wide
+    glyph cut at either edge becomes a blank. Non-ASCII strings are measured once per
+    (s, room, skip): the HUD labels, art and task lines repeat verbatim every frame.
+    """
+    if s.isascii(): return s[skip:skip+room]
+    key = (s, room, skip)
+    cells = _CLIPS.get(key)
+    if cells is None:
+        cells = _cells(s)[skip:]
+        if cells and cells[0] == "": cells = [" "] + cells[1:]
+        if len(cells) > room:
+            cells = cells[:room]
+            if cells and cell_width(cells[-1] or " ") == 2: cells = cells[:-1] + [" "]
+        if len(_CLIPS) >= CLIP_CACHE_MAX: _CLIPS.clear()
+        cells = _CLIPS[key] = tuple(cells)
+    return cells
+class FrameBuffer:
+    """
+    Cell grid (char + colour/attr) exposing the subset of the curses window API used by
+    safe_addstr/draw_box, so the drawing code can target it unchanged. flush() compares the
+    frame with the previous one and writes only the changed runs to the real window.
+    """
+    RUN_GAP = 3    # unchanged cells bridged inside a run to save a write call
+    def __init__(self, h, w):
+        self.resize(h, w)
+    def resize(self, h, w):
+        self.h, self.w = h, w
+        self._blank_c = [" "]*w
+        self._blank_a = [0]*w
+        self.erase()
+        self.invalidate()
+    def invalidate(self):
+        # forget what is on screen: the next flush repaints every cell
+        self.prev_chars = self.prev_attrs = None
+        self.last_runs = []
+    def getmaxyx(self): return self.h, self.w
+    def erase(self):
+        self.chars = [self._blank_c[:] for _ in range(self.h)]
+        self.attrs = [self._blank_a[:] for _ in range(self.h)]
+    def addstr(self, y, x, s, attr=0):
+        if y < 0 or y >= self.h or x < 0 or x >= self.w: return
+        self.addcells(y, x, clip_cells(s, self.w - x), attr)
+    def addcells(self, y, x, cells, attr=0):
+        # cells from clip_cells(), already fitted to the row by the caller (safe_addstr)
+        if cells: self.put(y, x, cells, [attr]*len(cells))
+    def put(self, y, x, cells, attrs):
+        # cells/attrs already clipped to the row (see addstr and StaticLayer)
+        end = x + len(cells)
+        rc = self.chars[y]
+        # never leave half of a wide glyph behind at either edge
+        if rc[x] == "" and x > 0: rc[x-1] = " "
+        if end < self.w and rc[end] == "": rc[end] = " "
+        rc[x:end] = cells
+        self.attrs[y][x:end] = attrs
+    def diff(self):
+        """Changed runs since the last flush as (y, x, text, attr); adopts the frame as on-screen."""
+        runs = []
+        w, gap = self.w, self.RUN_GAP
+        prev_c, prev_a = self.prev_chars, self.prev_attrs
+        for y in range(self.h):
+            rc, ra = self.chars[y], self.attrs[y]
+            if prev_c is None:
+                changed = range(w)
+            else:
+                pc, pa = prev_c[y], prev_a[y]
+                if rc == pc and ra == pa: continue
+                changed = [i for i in range(w) if rc[i] != pc[i] or ra[i] != pa[i]]
+            k, n = 0, len(changed)
+            while k < n:
+                x0 = changed[k]
+                if rc[x0] == "" and x0 > 0: x0 -= 1
+                a = ra[x0]
+                x1 = changed[k] + 1
+                k += 1
+                while k < n:
+                    j = changed[k]
+                    if j - x1 > gap or any(ra[t] != a for t in range(x1, j+1)): break
+                    x1 = j + 1; k += 1
+                if x1 < w and rc[x1] == "": x1 += 1
+                runs.append((y, x0, "".join(rc[x0:x1]), a))
+        self.prev_chars, self.prev_attrs = self.chars, self.attrs
+        self.last_runs = runs
+        return runs
+    def flush(self, win):
+        for y, x, text, attr in self.diff():
+            try:
+                win.addstr(y, x, text, attr)
+            except curses.error:
+                pass   # the bottom-right cell always raises after writing
+
+# Static layers: rarely-changing drawing (markers, panels) composed once, blitted per frame
+class StaticLayer:
+    """
+    Records drawing as clipped cell spans through the same window subset as FrameBuffer, so
+    safe_addstr/draw_box compose it unchanged; blit() copies the spans onto a frame.
+    """
+    __slots__ = ("h", "w", "key", "spans")
+    def __init__(self, h, w, key=None):
+        self.h, self.w, self.key = h, w, key
+        self.spans = []
+    def getmaxyx(self): return self.h, self.w
+    def addstr(self, y, x, s, attr=0):
+        if y < 0 or y >= self.h or x < 0 or x >= self.w: return
+        self.addcells(y, x, clip_cells(s, self.w - x), attr)
+    def addcells(self, y, x, cells, attr=0):
+        if cells: self.spans.append((y, x, cells, [attr]*len(cells)))
+    def blit(self, win):
+        if isinstance(win, FrameBuffer) and win.getmaxyx() == (self.h, self.w):
+            put = win.put
+            for y, x, cells, attrs in self.spans:
+                put(y, x, cells, attrs)
+            return
+        for y, x, cells, attrs in self.spans:
+            try:
+                win.addstr(y, x, "".join(cells), attrs[0] if attrs else 0)
+            except curses.error:
+                pass
+class LayerCache:
+    """Named StaticLayers, recomposed only when the window size or the caller's key changes."""
+    def __init__(self):
+        self.layers = {}
+        self.builds = 0
+    def blit(self, win, name, key, draw, *args):
+        h, w = win.getmaxyx()
+        key = (h, w, key)
+        layer = self.layers.get(name)
+        if layer is None or layer.key != key:
+            layer = self.layers[name] = StaticLayer(h, w, key)
+            draw(layer, *args)
+            self.builds += 1
+        layer.blit(win)
+    def clear(self):
+        self.layers.clear()
+class NullLayers:
+    """No caching: every layer is drawn straight onto the window each frame."""
+    def blit(self, win, name, key, draw, *args):
+        draw(win, *args)
+NULL_LAYERS = NullLayers()
+
 # Procedural generation
-def make_planet(idx):
-    art = random.choice(PLANET_ARTS)
+# interned value tables: compact records (sector map) store an index into these
+PLANET_TYPES = ("Terrestrial","Gas Giant","Ice","Oceanic","Volcanic","Desert")
+PLANET_ATMOS = ("N₂/O₂","CO₂","H₂/He","Thin","Toxic")
+PLANET_LIFE = ("None","Microbial","Simple","Complex")
+PLANET_DESCS = ("Rocky world","Ringed giant","Frozen cliffs","Deep oceans","Volcanic plains","Bright sands")
+STAR_CLASSES = ("O","B","A","F","G","K","M")
+# generators take an rng (default: the global random module); sessions pass their own seeded Random
+def make_planet(idx, rng=random):
+    art = rng.choice(PLANET_ARTS)
     return Planet(
         name=f"Planet-{chr(65+idx)}",
-        type=random.choice(["Terrestrial","Gas Giant","Ice","Oceanic","Volcanic","Desert"]),
-        atmos=random.choice(["N₂/O₂","CO₂","H₂/He","Thin","Toxic"]),
-        life=random.choice(["None","Microbial","Simple","Complex"]),
-        desc=random.choice(["Rocky world","Ringed giant","Frozen cliffs","Deep oceans","Volcanic plains","Bright sands"]),
+        type=rng.choice(PLANET_TYPES),
+        atmos=rng.choice(PLANET_ATMOS),
+        life=rng.choice(PLANET_LIFE),
+        desc=rng.choice(PLANET_DESCS),
         art=art
     )
-def make_star_system(i, w, h):
-    # place x,y within screen bounds
-    x = random.randint(6, max(6, w-8))
-    y = random.randint(4, max(4, h-6))
-    name = f"Sys-{random.choice(['Alfa','Beta','Delta','Sigma','Zeta','Tau'])}-{i}"
-    planets = [make_planet(j) for j in range(random.randint(1,4))]
-    history = random.choice([
+def make_star_system(i, rng=random):
+    # world coordinates: the screen position is derived per terminal size by place_system()
+    u, v = rng.random(), rng.random()
+    name = f"Sys-{rng.choice(['Alfa','Beta','Delta','Sigma','Zeta','Tau'])}-{i}"
+    planets = [make_planet(j, rng) for j in range(rng.randint(1,4))]
+    history = rng.choice([
         f"{name} once hosted ancient probes.",
         f"{name} is known for crystal nebulae.",
         f"{name} holds ruined orbital platforms.",
         f"{name} has a stable binary pair that affects tides."
     ])
     # occasional threat
-    threat = random.choice([None, "Radiation Storm", "Pirate Drones", None, None])
-    return StarSystem(name=name, x=x, y=y, planets=planets, history=history, threat=threat)
-def setup_galaxy_mission(galaxy_name, w, h):
-    # Each galaxy mission has 4-6 star systems and a list of tasks
-    n = random.randint(4,6)
-    systems = [make_star_system(i+1, w, h) for i in range(n)]
+    threat = rng.choice([None, "Radiation Storm", "Pirate Drones", None, None])
+    return StarSystem(name=name, u=u, v=v, planets=planets, history=history, threat=threat)
+def place_system(sys, w, h):
+    # same margins the screen-space generator used: x in [6, w-8], y in [4, h-6]
+    return sys._replace(x=6 + round(sys.u * max(0, w-14)), y=4 + round(sys.v * max(0, h-10)))
+def generate_galaxy(name, seed):
+    # everything about a galaxy follows from its own seed, so it can be rebuilt at any time
+    rng = random.Random(seed)
+    n = rng.randint(4,6)
+    return Galaxy(name, seed, tuple(make_star_system(i+1, rng) for i in range(n)))
+def setup_galaxy_mission(galaxy, w, h, rng=random):
+    # Each galaxy mission covers the galaxy's 4-6 star systems and a list of tasks
+    systems = [place_system(s, w, h) for s in galaxy.systems]
     # choose 2-3 systems as mission targets with tasks
-    targets = random.sample(systems, k=max(2, n//2))
+    targets = rng.sample(systems, k=max(2, len(systems)//2))
     tasks = []
     for s in targets:
-        task_type = random.choice(["Scan for life","Analyze composition","Collect sample","Map magnetosphere"])
+        task_type = rng.choice(["Scan for life","Analyze composition","Collect sample","Map magnetosphere"])
         tasks.append({"system": s.name, "task": task_type, "done": False, "reward": TASK_REWARD_BASE})
-    mission = {"galaxy": galaxy_name, "systems": systems, "tasks": tasks, "assigned_by": "Earth Command"}
+    mission = {"galaxy": galaxy.name, "systems": systems, "tasks": tasks, "assigned_by": "Earth Command"}
     return mission
+class Universe:
+    """
+    Lazily generated galaxies. Each galaxy's systems derive from a seed mixed from the
+    universe seed and its name; at most `capacity` are held (LRU), and prefetch() builds
+    one on the warp worker so the jump into it does not have to wait.
+    """
+    def __init__(self, seed, capacity=UNIVERSE_CACHE):
+        self.seed = seed
+        self.capacity = capacity
+        self.cache = OrderedDict()     # name -> Galaxy, most recently used last
+        self.pending = {}              # name -> Future of a prefetch in flight
+        self.lock = threading.Lock()
+        self.generated = 0
+    def galaxy_seed(self, name):
+        # string seeds hash deterministically (unlike hash(str)), across runs and platforms
+        return random.Random(f"{self.seed}/{name}").getrandbits(64)
+    def _build(self, name):
+        g = generate_galaxy(name, self.galaxy_seed(name))
+        with self.lock:
+            self.generated += 1
+            self.cache[name] = g
+            self.cache.move_to_end(name)
+            while len(self.cache) > self.capacity:
+                self.cache.popitem(last=False)
+            self.pending.pop(name, None)
+        return g
+    def galaxy(self, name):
+        with self.lock:
+            g = self.cache.get(name)
+            if g is not None:
+                self.cache.move_to_end(name)
+                return g
+            future = self.pending.get(name)
+        # either wait for the prefetch in flight or generate here; both give the same galaxy
+        return future.result() if future is not None else self._build(name)
+    def prefetch(self, name):
+        with self.lock:
+            if name in self.cache or name in self.pending: return
+            self.pending[name] = warp_pool().submit(self._build, name)
 # AI Copilot & Logs
 AI_HINTS = [
     "Sensors detect a faint signal ahead.",
@@ -177,455 +569,2804 @@ COPILOT_PERSONA = [
 
 # Save report helpers
 def save_report(report, fname_json="mission_report.json", fname_txt="mission_report.txt"):
+    # serialize once; the .txt variant is the same JSON after a header line
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    ok = True
     try:
         with open(fname_json, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
-    except Exception:
-        pass
+            f.write(text)
+    except OSError:
+        ok = False
     try:
         with open(fname_txt, "w", encoding="utf-8") as f:
             f.write("MISSION REPORT\n")
-            f.write(json.dumps(report, indent=2, ensure_ascii=False))
-    except Exception:
-        pass
+            f.write(text)
+    except OSError:
+        ok = False
+    return ok
 
-# Visual warp scene (cinematic)
-def warp_cinematic(win, duration=WARP_DURATION):
-    h,w = win.getmaxyx()
-    start = time.time()
-    msg = "🚀 WARP ENGAGED 🚀"
-    while time.time() - start < duration:
-        win.erase()
-        for _ in range(80):
+# Streaming mission event log (JSONL, append-only)
+class EventLog:
+    """
+    Append-only JSONL event log written by a background thread. emit() only enqueues, the
+    writer batches lines and flushes every `flush_interval` seconds (or `batch` events), so
+    disk I/O stays off the render thread and a crash loses at most one flush window.
+    """
+    _STOP = object()
+    def __init__(self, path, flush_interval=0.5, batch=256):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch = batch
+        self.error = None
+        self.q = queue.SimpleQueue()
+        self.f = open(path, "a", encoding="utf-8")
+        self.thread = threading.Thread(target=self._writer, name="voyager-eventlog", daemon=True)
+        self.thread.start()
+    def emit(self, kind, data):
+        rec = {"kind": kind, "wall": round(time.time(), 3)}
+        rec.update(data)
+        self.q.put(rec)
+    def _writer(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
             try:
-                y = random.randint(0, max(0,h-1))
-                x = random.randint(0, max(0,w-1))
-                safe_addstr(win, y, x, random.choice(["/", "\\", "|", "-"]), random.choice([2,3,4]))
-            except Exception:
-                pass
-        safe_addstr(win, h//2, max(0,(w - len(msg))//2), msg, 3)
-        win.refresh()
-        time.sleep(0.06)
-    win.erase(); win.refresh()
+                rec = self.q.get(timeout=timeout)
+            except queue.Empty:
+                rec = None
+            if rec is not None and rec is not self._STOP:
+                pending.append(json.dumps(rec, ensure_ascii=False))
+                if deadline is None: deadline = time.monotonic() + self.flush_interval
+            stop = rec is self._STOP
+            if pending and (stop or len(pending) >= self.batch or time.monotonic() >= deadline):
+                try:
+                    self.f.write("\n".join(pending) + "\n")
+                    self.f.flush()
+                except OSError as e:
+                    self.error = e   # keep draining so emit() never blocks the game
+                pending = []
+                deadline = None
+            if stop: break
+    def close(self):
+        self.q.put(self._STOP)
+        self.thread.join(timeout=5.0)
+        try:
+            self.f.close()
+        except OSError:
+            pass
 
-# Main run loop
-def run(stdscr, init_speed, density):
-    # initialize curses
-    curses.curs_set(0)
-    stdscr.nodelay(True)
-    stdscr.keypad(True)
-    curses.start_color()
-    curses.use_default_colors()
-    curses.init_pair(1, curses.COLOR_GREEN, -1)
-    curses.init_pair(2, curses.COLOR_CYAN, -1)
-    curses.init_pair(3, curses.COLOR_YELLOW, -1)
-    curses.init_pair(4, curses.COLOR_MAGENTA, -1)
-    curses.init_pair(5, curses.COLOR_RED, -1)
-    # Blue for important splash prompts
+class ReportBuilder:
+    """
+    Folds event-log records back into the mission_report.json structure. Every record
+    carries the running score/fuel/distance/energy totals, so the report is current after
+    any prefix of the log; a "session" record starts over.
+    """
+    def __init__(self):
+        self.report = None
+    def feed(self, rec):
+        kind = rec.get("kind")
+        if kind == "session":
+            # a resumed session (--resume) starts from the totals it carries
+            self.report = {
+                "missions_completed_count": rec.get("missions_completed", 0),
+                "current_mission": rec["galaxy"],
+                "tasks_status": [dict(t) for t in rec["tasks"]],
+                "visited_report": rec.get("visited_report", {}),
+                "systems_charted": rec.get("systems_charted", 0),
+            }
+        r = self.report
+        if r is None: return   # records before the first session header
+        if kind == "mission":
+            r["missions_completed_count"] += 1
+            r["current_mission"] = rec["galaxy"]
+            r["tasks_status"] = [dict(t) for t in rec["tasks"]]
+        elif kind == "scan" and rec.get("sector"):
+            r["systems_charted"] += 1
+        elif kind == "task":
+            for t in r["tasks_status"]:
+                if t["system"] == rec["system"] and t["task"] == rec["task"]:
+                    t["done"] = True
+            r["visited_report"].setdefault(rec["galaxy"], {"type": GALAXY_DB.get(rec["galaxy"], {}).get("type"), "systems": []})
+            r["visited_report"][rec["galaxy"]]["systems"].append({"system": rec["system"], "task": rec["task"]})
+        r["score"] = rec.get("score", r.get("score", 0))
+        r["distance_traveled_AU"] = round(rec.get("dist", r.get("distance_traveled_AU", 0.0)), 4)
+        r["energy_consumed"] = round(rec.get("energy", r.get("energy_consumed", 0.0)), 2)
+        r["fuel_remaining"] = round(rec.get("fuel", r.get("fuel_remaining", FUEL_MAX)), 2)
+        if "wall" in rec:
+            r["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(rec["wall"]))
+def rebuild_report(log_path, fname_json="mission_report.json", fname_txt="mission_report.txt"):
+    """Stream an event log and rewrite the mission report from its last session."""
+    builder = ReportBuilder()
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue   # torn final line after a crash
+            builder.feed(rec)
+    if builder.report is None:
+        return None
+    save_report(builder.report, fname_json, fname_txt)
+    return builder.report
+
+# Spatial index for scan / pickup / target queries
+class SpatialGrid:
+    """
+    Uniform grid of hashable items at integer or float positions. insert/remove are O(1);
+    radius, box and nearest-neighbour queries only visit cells that can hold a hit.
+    """
+    def __init__(self, cell=8):
+        self.cell = cell
+        self.cells = {}    # (cx, cy) -> {item: (x, y)}
+        self.pos = {}      # item -> (x, y)
+        self.bounds = None # occupied cell range seen since clear(); only grows
+    def __len__(self): return len(self.pos)
+    def __contains__(self, item): return item in self.pos
+    def _key(self, x, y):
+        return int(x // self.cell), int(y // self.cell)
+    def clear(self):
+        self.cells.clear(); self.pos.clear()
+        self.bounds = None
+    def insert(self, item, x, y):
+        if item in self.pos: self.remove(item)
+        self.pos[item] = (x, y)
+        key = self._key(x, y)
+        self.cells.setdefault(key, {})[item] = (x, y)
+        b = self.bounds
+        if b is None:
+            self.bounds = [key[0], key[1], key[0], key[1]]
+        else:
+            b[0] = min(b[0], key[0]); b[1] = min(b[1], key[1])
+            b[2] = max(b[2], key[0]); b[3] = max(b[3], key[1])
+    def remove(self, item):
+        xy = self.pos.pop(item, None)
+        if xy is None: return False
+        key = self._key(*xy)
+        bucket = self.cells[key]
+        del bucket[item]
+        if not bucket: del self.cells[key]
+        return True
+    def _span(self, x, y, r):
+        x0, y0 = self._key(x - r, y - r)
+        x1, y1 = self._key(x + r, y + r)
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket: yield bucket
+    def query_radius(self, x, y, r):
+        """Items within Euclidean distance r as (dist, item), nearest first."""
+        hits = []
+        for bucket in self._span(x, y, r):
+            for item, (ix, iy) in bucket.items():
+                d = math.hypot(ix - x, iy - y)
+                if d <= r: hits.append((d, item))
+        hits.sort(key=lambda h: h[0])
+        return hits
+    def query_box(self, x, y, r):
+        """Items within Chebyshev distance r as (dist, item), nearest (Euclidean) first."""
+        hits = []
+        for bucket in self._span(x, y, r):
+            for item, (ix, iy) in bucket.items():
+                if abs(ix - x) <= r and abs(iy - y) <= r:
+                    hits.append((math.hypot(ix - x, iy - y), item))
+        hits.sort(key=lambda h: h[0])
+        return hits
+    def nearest(self, x, y, pred=None, max_dist=float("inf")):
+        """(dist, item) of the nearest item accepted by pred, or None; searches rings of cells outward."""
+        if not self.pos: return None
+        cells, size = self.cells, self.cell
+        cx, cy = self._key(x, y)
+        # never search past the outermost occupied cell
+        b = self.bounds
+        limit = max(cx - b[0], b[2] - cx, cy - b[1], b[3] - cy)
+        best = None
+        ring = 0
+        while True:
+            for kx in range(cx - ring, cx + ring + 1):
+                edge = kx in (cx - ring, cx + ring)
+                for ky in (range(cy - ring, cy + ring + 1) if edge else (cy - ring, cy + ring)):
+                    bucket = cells.get((kx, ky))
+                    if not bucket: continue
+                    for item, (ix, iy) in bucket.items():
+                        if pred is not None and not pred(item): continue
+                        d = math.hypot(ix - x, iy - y)
+                        if d <= max_dist and (best is None or d < best[0]):
+                            best = (d, item)
+            # anything in ring+1 is at least ring*cell away
+            if best is not None and best[0] <= ring * size: return best
+            if ring * size > max_dist or ring >= limit: return best
+            ring += 1
+
+# Sector map: an unbounded plane of background systems, generated a chunk at a time
+class SectorChunk:
+    """Systems of one chunk as parallel columns; text fields are codes into the PLANET_* tables."""
+    __slots__ = ("cx", "cy", "xs", "ys", "star", "planets", "ptype", "atmos", "life")
+    def __init__(self, cx, cy, seed):
+        self.cx, self.cy = cx, cy
+        self.xs, self.ys = array("i"), array("i")
+        self.star, self.planets, self.ptype, self.atmos, self.life = (array("B") for _ in range(5))
+        rng = random.Random(f"{seed}/{cx}/{cy}")
+        for _ in range(rng.choice((0, 1, 1, 2))):
+            self.xs.append(cx * SECTOR_CHUNK_W + rng.randrange(2, SECTOR_CHUNK_W - 2))
+            self.ys.append(cy * SECTOR_CHUNK_H + rng.randrange(1, SECTOR_CHUNK_H - 1))
+            self.star.append(rng.randrange(len(STAR_CLASSES)))
+            self.planets.append(rng.randint(0, 4))
+            self.ptype.append(rng.randrange(len(PLANET_TYPES)))
+            self.atmos.append(rng.randrange(len(PLANET_ATMOS)))
+            self.life.append(rng.randrange(len(PLANET_LIFE)))
+    def __len__(self): return len(self.xs)
+class PackedIdSet:
+    """
+    Set of 64-bit ids at about 8 bytes each: a sorted array plus a small buffer set that is
+    merged in when it fills, so membership is one set lookup and one bisect.
+    """
+    def __init__(self, buffer=16384):
+        self.sorted = array("Q")
+        self.recent = set()
+        self.buffer = buffer
+    def __len__(self): return len(self.sorted) + len(self.recent)
+    def __contains__(self, k):
+        if k in self.recent: return True
+        i = bisect.bisect_left(self.sorted, k)
+        return i < len(self.sorted) and self.sorted[i] == k
+    def add(self, k):
+        if k in self: return False
+        self.recent.add(k)
+        if len(self.recent) >= self.buffer:
+            self.sorted = array("Q", sorted(itertools.chain(self.sorted, self.recent)))
+            self.recent.clear()
+        return True
+def sector_id(galaxy_idx, cx, cy, i):
+    # galaxy (15 bits) | chunk x, y (20 bits each, two's complement) | system in chunk (8 bits)
+    return ((galaxy_idx & 0x7FFF) << 48) | ((cx & 0xFFFFF) << 28) | ((cy & 0xFFFFF) << 8) | (i & 0xFF)
+class SectorMap:
+    """
+    Background systems of one galaxy on an unbounded plane of chunks. page() loads the
+    chunks around the view from the galaxy seed and evicts those SECTOR_KEEP chunks past it;
+    an evicted chunk regenerates identically when the ship returns.
+    """
+    def __init__(self, galaxy_idx, seed):
+        self.galaxy_idx, self.seed = galaxy_idx, seed
+        self.chunks = {}
+        self.version = 0      # bumped when the loaded set changes
+        self.view = None
+    def page(self, x0, y0, w, h):
+        view = (x0, y0, w, h)
+        if view == self.view: return
+        self.view = view
+        cx0, cx1 = (x0 // SECTOR_CHUNK_W) - 1, ((x0 + w) // SECTOR_CHUNK_W) + 1
+        cy0, cy1 = (y0 // SECTOR_CHUNK_H) - 1, ((y0 + h) // SECTOR_CHUNK_H) + 1
+        changed = False
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                if (cx, cy) not in self.chunks:
+                    self.chunks[(cx, cy)] = SectorChunk(cx, cy, self.seed)
+                    changed = True
+        k = SECTOR_KEEP
+        far = [key for key in self.chunks
+               if not (cx0 - k <= key[0] <= cx1 + k and cy0 - k <= key[1] <= cy1 + k)]
+        for key in far:
+            del self.chunks[key]
+        if changed or far: self.version += 1
+    def systems_in(self, x0, y0, x1, y1):
+        """(chunk, index, x, y) of loaded systems inside the cell box [x0,x1) x [y0,y1)."""
+        for cy in range(y0 // SECTOR_CHUNK_H, (y1 - 1) // SECTOR_CHUNK_H + 1):
+            for cx in range(x0 // SECTOR_CHUNK_W, (x1 - 1) // SECTOR_CHUNK_W + 1):
+                c = self.chunks.get((cx, cy))
+                if c is None: continue
+                for i, (x, y) in enumerate(zip(c.xs, c.ys)):
+                    if x0 <= x < x1 and y0 <= y < y1:
+                        yield c, i, x, y
+    def nearest(self, x, y, r):
+        r_i = int(math.ceil(r))
+        best = None
+        for c, i, sx, sy in self.systems_in(x - r_i, y - r_i, x + r_i + 1, y + r_i + 1):
+            d = math.hypot(sx - x, sy - y)
+            if d <= r and (best is None or d < best[0]):
+                best = (d, c, i)
+        return best
+    def system_id(self, c, i):
+        return sector_id(self.galaxy_idx, c.cx, c.cy, i)
+    @staticmethod
+    def name(c, i):
+        return f"Sector {c.cx:+d},{c.cy:+d}/{i+1}"
+    def describe(self, c, i):
+        n = c.planets[i]
+        if not n:
+            return f"{self.name(c, i)}: class {STAR_CLASSES[c.star[i]]} star, no planets."
+        return (f"{self.name(c, i)}: class {STAR_CLASSES[c.star[i]]} star, {n} planet(s); "
+                f"{PLANET_TYPES[c.ptype[i]]}, {PLANET_ATMOS[c.atmos[i]]} air, life: {PLANET_LIFE[c.life[i]]}.")
+
+# Timed entities
+class ExpiryQueue:
+    """
+    Live entities ordered by expiry key (seconds, or any other monotonic clock) in a heap.
+    push() and cancel() are O(log n) (cancelled entries are dropped lazily), iteration yields
+    live entities in insertion order, and pop_expired() only touches entries that are due.
+    """
+    def __init__(self):
+        self.heap = []
+        self.live = {}     # entity -> heap entry [key, seq, entity, alive]
+        self._seq = itertools.count()
+    def __len__(self): return len(self.live)
+    def __iter__(self): return iter(list(self.live))
+    def __contains__(self, entity): return entity in self.live
+    def push(self, entity, key):
+        # re-pushing an entity reschedules it
+        self.cancel(entity)
+        entry = [key, next(self._seq), entity, True]
+        self.live[entity] = entry
+        heapq.heappush(self.heap, entry)
+    def cancel(self, entity):
+        entry = self.live.pop(entity, None)
+        if entry is None: return False
+        entry[3] = False
+        if len(self.heap) > 64 and len(self.heap) > 2 * len(self.live):
+            # mostly tombstones: compact so the heap stays proportional to live entities
+            self.heap = [e for e in self.heap if e[3]]
+            heapq.heapify(self.heap)
+        return True
+    def expires_at(self, entity):
+        entry = self.live.get(entity)
+        return entry[0] if entry else None
+    def pop_expired(self, now):
+        """Yield entities whose key is <= now, earliest first. Entities cancelled or
+        rescheduled by the consumer while iterating are honoured."""
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if entry[3]:
+                entry[3] = False
+                del self.live[entry[2]]
+                yield entry[2]
+    def clear(self):
+        self.heap.clear(); self.live.clear()
+
+# Warp: the next galaxy is generated off-thread (Universe.prefetch) before the jump
+WARP_BANNER = "🚀 WARP ENGAGED 🚀"
+ENTER_BANNER_TIME = 0.9
+ENTER_DELAY = 1.0           # "Entering <galaxy>" pause after the mission brief; any key skips it
+def warp_fuel_cost():
+    return FUEL_CONSUMPTION_MOVE * WARP_FUEL_MULT * 4.0
+_warp_pool = None
+def warp_pool():
+    global _warp_pool
+    if _warp_pool is None:
+        _warp_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voyager-warp")
+    return _warp_pool
+
+# Profiling: per-phase frame timing
+class FrameProfiler:
+    """
+    Lap timer for the main loop. begin() opens a frame, lap(name) charges the time since the
+    previous mark to `name`, end() closes the frame. Time lapped as "idle" (sleeping for the
+    next tick) is reported but not counted in "frame". Each phase keeps a rolling window of
+    samples and a cumulative fixed-bucket histogram.
+    """
+    enabled = True
+    BUCKETS_MS = (0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133)
+    def __init__(self, window=240):
+        self.window = window
+        self.samples = {}    # phase -> deque of seconds
+        self.hist = {}       # phase -> counts per BUCKETS_MS bucket (+ overflow)
+        self.totals = {}     # phase -> [count, seconds]
+        self._cur = {}
+        self._start = self._mark = 0.0
+    def begin(self):
+        self._start = self._mark = time.perf_counter()
+        self._cur = {}
+    def lap(self, name):
+        now = time.perf_counter()
+        self._cur[name] = self._cur.get(name, 0.0) + (now - self._mark)
+        self._mark = now
+    def end(self):
+        self._cur["frame"] = time.perf_counter() - self._start - self._cur.get("idle", 0.0)
+        for name, d in self._cur.items():
+            q = self.samples.get(name)
+            if q is None:
+                q = self.samples[name] = deque(maxlen=self.window)
+                self.hist[name] = [0] * (len(self.BUCKETS_MS) + 1)
+                self.totals[name] = [0, 0.0]
+            q.append(d)
+            self.hist[name][bisect.bisect_left(self.BUCKETS_MS, d * 1000.0)] += 1
+            tot = self.totals[name]
+            tot[0] += 1; tot[1] += d
+    def stats(self, name):
+        q = self.samples.get(name)
+        if not q: return None
+        vals = sorted(q)
+        return {"mean_ms": round(sum(vals) / len(vals) * 1000.0, 3),
+                "p50_ms": round(percentile(vals, 50) * 1000.0, 3),
+                "p95_ms": round(percentile(vals, 95) * 1000.0, 3),
+                "max_ms": round(vals[-1] * 1000.0, 3)}
+    def summary(self):
+        out = {}
+        for name in self.samples:
+            st = self.stats(name)
+            count, total = self.totals[name]
+            st.update({"count": count, "total_s": round(total, 4),
+                       "histogram_ms": dict(zip([f"<={b}" for b in self.BUCKETS_MS] + ["more"], self.hist[name]))})
+            out[name] = st
+        return out
+    def dump(self, path):
+        report = {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "window_frames": self.window,
+                  "target_frame_ms": round(1000.0 / FPS, 3), "phases": self.summary()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+class NullProfiler:
+    """Disabled profiler: every hook is a no-op so the instrumentation can stay in place."""
+    enabled = False
+    def begin(self): pass
+    def lap(self, name): pass
+    def end(self): pass
+NULL_PROFILER = NullProfiler()
+class StartupTrace:
+    """
+    Where time goes between process start and the first game frame. mark(name) charges the
+    time since the previous mark to `name` (wait=True for time spent on the player, e.g. the
+    splash); span(name, start, end) records work done on a background thread, off the path.
+    """
+    enabled = True
+    def __init__(self, t0=STARTUP_T0):
+        self.t0 = self._mark = t0
+        self.phases = []        # (name, seconds, seconds since start, wait)
+        self.background = []    # (name, seconds, finished at, seconds since start)
+    def mark(self, name, wait=False):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._mark, now - self.t0, wait))
+        self._mark = now
+    def span(self, name, start, end):
+        self.background.append((name, end - start, end - self.t0))
+    def summary(self):
+        ms = lambda t: round(t * 1000.0, 2)
+        waited = sum(d for _, d, _, wait in self.phases if wait)
+        game = self.phases[-1][2] if self.phases and self.phases[-1][0] == "first game frame" else None
+        first = next((at for name, _, at, _ in self.phases if name == "first frame"), game)
+        return {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "first_frame_ms": None if first is None else ms(first),
+                "first_game_frame_ms": None if game is None else ms(game),
+                "waiting_ms": ms(waited),
+                "first_game_frame_unattended_ms": None if game is None else ms(game - waited),
+                "phases": [{"phase": n, "ms": ms(d), "at_ms": ms(at), "wait": wait} for n, d, at, wait in self.phases],
+                "background": [{"task": n, "ms": ms(d), "done_at_ms": ms(at)} for n, d, at in self.background]}
+    def write(self, f):
+        for name, d, at, wait in self.phases:
+            f.write(f"{name:>18} {d*1000.0:9.1f} ms   at {at*1000.0:8.1f} ms{'   (waiting on the player)' if wait else ''}\n")
+        for name, d, at in self.background:
+            f.write(f"{name:>18} {d*1000.0:9.1f} ms   done at {at*1000.0:8.1f} ms   (background)\n")
+class NullStartupTrace:
+    """Disabled startup trace."""
+    enabled = False
+    def mark(self, name, wait=False): pass
+    def span(self, name, start, end): pass
+NULL_TRACE = NullStartupTrace()
+def preload_numpy(trace=NULL_TRACE):
+    """Start importing NumPy on a daemon thread so it overlaps terminal setup and the splash."""
+    def load():
+        t0 = time.perf_counter()
+        load_numpy()
+        trace.span("numpy import", t0, time.perf_counter())
+    threading.Thread(target=load, name="numpy-preload", daemon=True).start()
+def draw_perf_overlay(win, prof, w):
+    # two short lines right of Score/Dist (row 2 belongs to the MISSION panel border)
+    frame = prof.stats("frame")
+    if not frame: return
+    phases = [(n, prof.stats(n)["mean_ms"]) for n in prof.samples if n not in ("frame", "idle")]
+    top = max(phases, key=lambda p: p[1]) if phases else ("-", 0.0)
+    col = 1 if frame["p95_ms"] <= 1000.0 / FPS else 5
+    x = max(0, w - 19)
+    safe_addstr(win, 0, x, f"frm {frame['mean_ms']:4.1f}/{frame['p95_ms']:4.1f}ms", col)
+    safe_addstr(win, 1, x, f"{top[0][:10]} {top[1]:4.1f}ms", 1)
+
+# Fixed-timestep scheduling
+def per_tick(chance, dt):
+    # spawn odds were tuned per frame at FPS; scale them so rates per second hold for any dt
+    return chance * dt * FPS
+class FixedStepScheduler:
+    """
+    Accumulator clock for the main loop: the simulation advances in fixed `step` increments
+    regardless of render cost, rendering happens at most `render_hz` times a second, and
+    under load renders are skipped before simulation ticks are.
+    """
+    def __init__(self, tick_hz=SIM_HZ, render_hz=FPS, max_steps=8):
+        self.step = 1.0 / tick_hz
+        self.render_interval = 1.0 / render_hz
+        self.max_steps = max_steps
+        self.skipped_renders = 0
+        self.dropped_ticks = 0
+        self.reset(time.perf_counter())
+    def reset(self, now):
+        # forget elapsed wall time (after a pause or a blocking screen)
+        self.last = now
+        self.acc = 0.0
+        self.next_render = now
+        self.last_render = now - self.render_interval
+    def advance(self, now):
+        """Number of fixed ticks to run for the wall time elapsed since the last call."""
+        self.acc += max(0.0, now - self.last)
+        self.last = now
+        n = int(self.acc / self.step)
+        if n > self.max_steps:
+            # hopelessly behind: let game time slip rather than spiral further behind
+            self.dropped_ticks += n - self.max_steps
+            self.acc -= (n - self.max_steps) * self.step
+            n = self.max_steps
+        self.acc -= n * self.step
+        return n
+    def alpha(self, now):
+        # progress towards the next tick, used to interpolate render positions
+        return min(1.0, (self.acc + max(0.0, now - self.last)) / self.step)
+    def render_due(self, now, urgent=False):
+        # urgent (input just applied): render now, but never above twice the render rate
+        if urgent and now - self.last_render >= self.render_interval / 2:
+            self.next_render = min(self.next_render, now)
+        if now < self.next_render:
+            return False
+        late = int((now - self.next_render) / self.render_interval)
+        self.skipped_renders += late
+        self.next_render += (late + 1) * self.render_interval
+        self.last_render = now
+        return True
+    def tick_wait(self, now):
+        return max(0.0, self.step - self.acc - (now - self.last))
+    def render_wait(self, now):
+        return max(0.0, self.next_render - now)
+class QualityController:
+    """
+    Adaptive level of detail. Each rendered frame reports how much of its wall time was
+    spent working rather than sleeping; a smoothed busy fraction above LOD_HIGH steps
+    `level` down, one below LOD_LOW steps it back up. The gap between the thresholds and
+    the hold time after every step keep the level from flickering.
+    """
+    SMOOTH_TAU = 0.25  # seconds; time-weighted so a few very slow frames count fully
+    STEP_DOWN, STEP_UP = 0.75, 1.1
+    def __init__(self, budget, now):
+        self.budget = budget      # seconds per frame at the render rate
+        self.level = 1.0
+        self.load = 0.0
+        self.changes = 0
+        self.hold_until = now
+        self.reset(now)
+    def reset(self, now):
+        # forget the frame in progress (e.g. after the too-small screen paused the loop)
+        self.frame_t0, self.busy = now, 0.0
+    def add_busy(self, seconds):
+        # simulation and render work since the last frame; the rest of the wall time was idle
+        self.busy += seconds
+    def frame_done(self, now):
+        """Account one rendered frame; True when `level` changed."""
+        elapsed = now - self.frame_t0
+        busy = min(elapsed, self.busy)
+        self.reset(now)
+        weight = 1.0 - math.exp(-elapsed / self.SMOOTH_TAU)
+        self.load += weight * (busy / max(elapsed, self.budget) - self.load)
+        if now < self.hold_until: return False
+        if self.load > LOD_HIGH and self.level > LOD_MIN:
+            self.level = max(LOD_MIN, self.level * self.STEP_DOWN)
+            self.hold_until = now + LOD_HOLD_DOWN
+        elif self.load < LOD_LOW and self.level < 1.0:
+            self.level = min(1.0, self.level * self.STEP_UP)
+            self.hold_until = now + LOD_HOLD_UP
+        else:
+            return False
+        self.changes += 1
+        return True
+
+# Headless simulation core
+KEYS_QUIT = (ord('q'), ord('Q'), 27)
+class Voyage:
+    """
+    Game state and rules for one session, advanced by tick(dt, keys) without any terminal.
+    Time is the simulation clock `t` (sum of the dt values fed in) and all randomness comes
+    from generators seeded by `seed`, so the same seed, key stream and dt reproduce the same
+    voyage. `rng` drives gameplay; `fx_rng` only drives visuals (stars, galaxy sprites), so
+    visual settings never perturb gameplay. Notable happenings are queued in `events`.
+    """
+    def __init__(self, w, h, speed=DEFAULT_SPEED, density=STAR_DENSITY, engine="auto", seed=None):
+        self.w, self.h = w, h
+        self.t = 0.0
+        self.running = True
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.fx_rng = random.Random(self.rng.getrandbits(64))
+        self.speed = max(MIN_SPEED, min(MAX_SPEED, speed))
+        self.visual_speed = min(self.speed, VISUAL_SPEED_CAP)
+        self.stars = make_starfield(max(30, density), w, h, engine, self.fx_rng)
+        self.lod = 1.0              # cosmetic detail level, see set_lod()
+        # timed entities: packs expire on the sim clock, sprites on the sprite odometer,
+        # and transient state ("warp", "banner", "copilot") on self.timers
+        self.power_packs = ExpiryQueue()
+        self.galaxy_sprites = ExpiryQueue()
+        self.sprite_odo = self.prev_sprite_odo = 0.0
+        self.timers = ExpiryQueue()
+        self.universe = Universe(self.rng.getrandbits(64))
+        self.galaxy_idx = self.rng.randrange(len(GALAXY_NAMES))
+        self.galaxy = GALAXY_NAMES[self.galaxy_idx]
+        self.mission = setup_galaxy_mission(self.universe.galaxy(self.galaxy), w, h, self.rng)
+        self.prefetch_next()
+        # spatial indexes: mission systems by name, live power packs by object
+        self.system_index = SpatialGrid(cell=8)
+        self.pack_index = SpatialGrid(cell=4)
+        self.static_version = 0     # bumped when the markers, mission panel or map change
+        self.index_mission()
+        self.missions_completed = 0
+        self.visited_report = {}    # galaxies with completed tasks only, so it scales with play
+        self.score = 0
+        self.fuel = FUEL_MAX
+        self.energy_consumed = 0.0
+        self.dist_traveled = 0.0
+        self.show_ai = False
+        self.show_map = False
+        self.show_log = False
+        self.braille = False        # stars as 2x4-dot Braille cells instead of one glyph per star
+        self.copilot_msg = "AI: Systems online. Earth Command standing by."
+        self.copilot_timer = 0.0
+        self.copilot_fresh = False  # within 6s of the last message: no periodic hints
+        self.crew_logs = ["Captain's Log: Voyager commissioned.", "Engineer: Fusion cores stable.", "XO: Crew ready."]
+        self.last_hint_time = 0.0
+        self.ship_art = self.rng.choice(SHIP_VARIANTS)
+        self.ship_x = w//2          # ship and systems are in world cells; the view starts
+        self.ship_y = h//2          # at the origin and scrolls with the ship (cam_x/cam_y)
+        self.cam_x = self.cam_y = 0
+        self.sector = SectorMap(self.galaxy_idx, self.universe.galaxy_seed(self.galaxy))
+        self.charted = PackedIdSet()   # sector systems scanned this session, all galaxies
+        self.warp_active = False
+        self.warp_start = 0.0
+        self.warp_target = None     # galaxy index being jumped to
+        self.banner = None          # (text, until t) centred message
+        self.events = []
+        self.prof = NULL_PROFILER
+        self.autopilot = None       # engaged Autopilot (O key), shown in the HUD (driven by run())
+        self.timers.push("fuel_snapshot", FUEL_SNAPSHOT_EVERY)
+        self.emit("session", galaxy=self.galaxy, tasks=[dict(t) for t in self.mission["tasks"]])
+    def resize(self, w, h):
+        if (w, h) == (self.w, self.h): return
+        self.w, self.h = w, h
+        # systems live in world space: re-place them for the new size, no regeneration
+        self.mission["systems"] = [place_system(s, w, h) for s in self.mission["systems"]]
+        self.index_mission()
+        self.follow()
+    def follow(self):
+        # scroll the view when the ship comes within the scroll margin of an edge
+        ship_w = SHIP_VARIANTS[0].__len__()
+        mx = min(SCROLL_MARGIN_X, max(2, (self.w - ship_w) // 3))
+        my = min(SCROLL_MARGIN_Y, max(2, (self.h - ship_w) // 3))
+        cam_x, cam_y = self.cam_x, self.cam_y
+        if self.ship_x - cam_x < mx: cam_x = self.ship_x - mx
+        elif self.ship_x - cam_x > self.w - ship_w - mx: cam_x = self.ship_x - (self.w - ship_w - mx)
+        if self.ship_y - cam_y < my: cam_y = self.ship_y - my
+        elif self.ship_y - cam_y > self.h - ship_w - my: cam_y = self.ship_y - (self.h - ship_w - my)
+        self.cam_x, self.cam_y = cam_x, cam_y
+    def prefetch_next(self):
+        self.universe.prefetch(GALAXY_NAMES[(self.galaxy_idx + 1) % len(GALAXY_NAMES)])
+    def set_lod(self, level):
+        # scales only cosmetic work (live stars, sprite spawns); gameplay never reads it
+        self.lod = level
+        self.stars.set_active(max(30, int(round(len(self.stars) * level))))
+    def emit(self, kind, **data):
+        # every event carries the running totals so a report can be rebuilt from any prefix
+        data.update(t=round(self.t, 3), score=self.score, fuel=round(self.fuel, 2),
+                    dist=round(self.dist_traveled, 4), energy=round(self.energy_consumed, 2))
+        self.events.append((kind, data))
+    def pop_events(self):
+        ev, self.events = self.events, []
+        return ev
+    def index_mission(self):
+        # rebuilt whenever the mission changes; open_tasks maps system name -> undone task
+        self.static_version += 1
+        self.systems_by_name = {sys.name: sys for sys in self.mission["systems"]}
+        self.system_index.clear()
+        for sys in self.mission["systems"]:
+            self.system_index.insert(sys.name, sys.x, sys.y)
+        self.open_tasks = {}
+        for t in self.mission["tasks"]:
+            if not t["done"]: self.open_tasks.setdefault(t["system"], t)
+    def nearest_target(self):
+        """(distance, system) of the closest system with an undone task, or None."""
+        hit = self.system_index.nearest(self.ship_x, self.ship_y, self.open_tasks.__contains__)
+        return (hit[0], self.systems_by_name[hit[1]]) if hit else None
+    def say(self, msg):
+        self.copilot_msg = msg
+        self.copilot_timer = self.t
+        self.copilot_fresh = True
+        self.timers.push("copilot", self.t + 6.0)
+    def show_banner(self, text, duration):
+        self.banner = (text, self.t + duration)
+        self.timers.push("banner", self.t + duration)
+    def tick(self, dt, keys=()):
+        prof = self.prof
+        self.t += dt
+        for k in keys:
+            self.handle_key(k)
+            if not self.running: return
+        prof.lap("input")
+        speed, w, h = self.speed, self.w, self.h
+        # fuel consumption while moving (approx based on dt)
+        movement_fuel = FUEL_CONSUMPTION_MOVE * dt * (1 + max(0.0, speed - 1.0))
+        self.fuel = max(0.0, self.fuel - movement_fuel)
+        self.energy_consumed += movement_fuel
+        # distance metric (use speed * dt)
+        self.dist_traveled += speed * dt * 0.08
+        # spawn powerpacks occasionally
+        if self.rng.random() < per_tick(POWER_SPAWN_CHANCE, dt):
+            px = self.cam_x + self.rng.randint(6, max(6, w-8))
+            py = self.cam_y + self.rng.randint(4, max(4, h-6))
+            pp = PowerPack(px, py, self.t)
+            self.power_packs.push(pp, self.t + POWER_LIFE)
+            self.pack_index.insert(pp, px, py)
+        self.sector.page(self.cam_x, self.cam_y, w, h)
+        for name in self.timers.pop_expired(self.t):
+            if name == "warp":
+                self.finish_warp()
+            elif name == "banner":
+                self.banner = None
+            elif name == "copilot":
+                self.copilot_fresh = False
+            elif name == "fuel_snapshot":
+                self.emit("fuel")
+                self.timers.push("fuel_snapshot", self.t + FUEL_SNAPSHOT_EVERY)
+        # star visuals update (use visual_speed cap); warp streaks ride the same pipeline
+        self.visual_speed = visual_speed = min(speed, VISUAL_SPEED_CAP)
+        if self.warp_active:
+            visual_speed *= 3.0
+        prof.lap("sim")
+        self.stars.step(visual_speed, dt, w, h, self.t)
+        prof.lap("stars.step")
+        # occasionally show galaxy sprite
+        self.prev_sprite_odo = self.sprite_odo
+        self.sprite_odo += dt * visual_speed * 0.22
+        if self.fx_rng.random() < per_tick(0.0009, dt) * self.lod:
+            gal_art = GALAXY_DB[self.galaxy]["art"]
+            g = GalaxySprite(self.galaxy, gal_art, w, h, self.sprite_odo, self.fx_rng)
+            self.galaxy_sprites.push(g, self.sprite_odo + (Z_MAX - SPRITE_Z_MIN))
+        for _ in self.galaxy_sprites.pop_expired(self.sprite_odo):
+            pass
+        prof.lap("sprites.step")
+        # expire power packs
+        for pp in self.power_packs.pop_expired(self.t):
+            self.pack_index.remove(pp)
+        prof.lap("packs.expire")
+        # periodic copilot hints while the AI panel is open
+        if self.show_ai and not self.copilot_fresh:
+            if self.t - self.last_hint_time > 4.0 and self.rng.random() < per_tick(0.06, dt):
+                self.say(self.rng.choice(COPILOT_PERSONA + AI_HINTS))
+                self.last_hint_time = self.t
+        prof.lap("sim")
+    def handle_key(self, k):
+        if k in KEYS_QUIT:
+            self.running = False
+        elif k in (curses.KEY_LEFT, ord('a'), ord('A')):
+            self.ship_x -= 1
+            self.follow()
+        elif k in (curses.KEY_RIGHT, ord('d'), ord('D')):
+            self.ship_x += 1
+            self.follow()
+        elif k in (curses.KEY_UP, ord('w'), ord('W')):
+            self.ship_y -= 1
+            self.follow()
+        elif k in (curses.KEY_DOWN, ord('s'), ord('S')):
+            self.ship_y += 1
+            self.follow()
+        elif k in (ord('+'), ord('=')):
+            self.speed = min(MAX_SPEED, self.speed + 0.2)
+        elif k in (ord('-'), ord('_')):
+            self.speed = max(MIN_SPEED, self.speed - 0.2)
+        elif k in (ord('i'), ord('I')):
+            self.show_ai = not self.show_ai
+        elif k in (ord('g'), ord('G')):
+            self.show_map = not self.show_map
+        elif k in (ord('b'), ord('B')):
+            self.braille = not self.braille
+        elif k in (ord('l'), ord('L')):
+            self.show_log = True
+        elif k in (ord('p'), ord('P')):
+            self.pickup()
+        elif k in (ord('x'), ord('X'), ord(' ')):  # scan / sample
+            self.scan()
+        elif k in (ord('z'), ord('Z')):
+            self.warp()
+        elif k in (ord('o'), ord('O')):
+            # a game key like any other: the message touches copilot state, so it must be recorded
+            self.autopilot = None if self.autopilot else Autopilot()
+            self.say("ANDROID AI: Autopilot engaged." if self.autopilot else "ANDROID AI: Autopilot off, manual control.")
+    def pickup(self):
+        # pick up the closest power pack within the collect box
+        hits = self.pack_index.query_box(self.ship_x, self.ship_y, POWER_COLLECT_RADIUS)
+        picked = hits[0][1] if hits else None
+        if picked:
+            self.power_packs.cancel(picked)
+            self.pack_index.remove(picked)
+            self.score += 100
+            self.fuel = min(FUEL_MAX, self.fuel + 60.0)
+            self.energy_consumed += FUEL_CONSUMPTION_PICK
+            self.say("ANDROID AI: Power cache secured. Energy redistributed.")
+            self.emit("pickup", x=picked.x, y=picked.y)
+    def scan(self):
+        # nearest star system within the (Euclidean) scan radius around the ship
+        hits = self.system_index.query_radius(self.ship_x, self.ship_y, SCAN_RADIUS)
+        if not hits:
+            self.chart()
+            return
+        sys = self.systems_by_name[hits[0][1]]
+        # consume fuel and do task if any tasks target this system
+        if self.fuel < FUEL_CONSUMPTION_SCAN:
+            self.say("ANDROID AI: Insufficient fuel to scan.")
+            return
+        self.fuel -= FUEL_CONSUMPTION_SCAN
+        self.energy_consumed += FUEL_CONSUMPTION_SCAN
+        t = self.open_tasks.pop(sys.name, None)
+        if t is not None:
+            t["done"] = True
+            reward = t.get("reward", TASK_REWARD_BASE)
+            self.score += reward
+            self.say(f"ANDROID AI: Task '{t['task']}' completed at {sys.name}. +{reward} pts.")
+            # record visited
+            visited = self.visited_report.setdefault(self.galaxy, {"type": GALAXY_DB[self.galaxy]["type"], "systems": []})
+            visited["systems"].append({"system": sys.name, "task": t["task"]})
+            self.static_version += 1
+            self.emit("task", galaxy=self.galaxy, system=sys.name, task=t["task"], reward=reward)
+        else:
+            # generic scan: small reward for discovering info
+            self.score += 20
+            self.say(f"ANDROID AI: Scanned {sys.name}. {sys.history}")
+            self.emit("scan", galaxy=self.galaxy, system=sys.name)
+    def chart(self):
+        # scan a background sector system: points only the first time it is charted
+        hit = self.sector.nearest(self.ship_x, self.ship_y, SCAN_RADIUS)
+        if hit is None:
+            self.say("ANDROID AI: No nearby system to scan. Move closer to a star-system marker.")
+            return
+        if self.fuel < FUEL_CONSUMPTION_SCAN:
+            self.say("ANDROID AI: Insufficient fuel to scan.")
+            return
+        self.fuel -= FUEL_CONSUMPTION_SCAN
+        self.energy_consumed += FUEL_CONSUMPTION_SCAN
+        _, c, i = hit
+        if not self.charted.add(self.sector.system_id(c, i)):
+            self.say(f"ANDROID AI: {self.sector.name(c, i)} is already charted.")
+            return
+        self.sector.version += 1
+        self.score += 20
+        self.say(f"ANDROID AI: Charted {self.sector.describe(c, i)}")
+        self.emit("scan", galaxy=self.galaxy, system=self.sector.name(c, i), sector=True)
+    def warp(self):
+        # manual warp: consume big fuel and jump to next galaxy (if fuel); the jump itself
+        # is a WARP_DURATION phase of the main loop, finished by finish_warp()
+        if self.warp_active:
+            self.say("ANDROID AI: Warp already in progress.")
+            return
+        needed = warp_fuel_cost()
+        if self.fuel < needed:
+            self.say("ANDROID AI: Not enough fuel for warp.")
+            return
+        self.fuel -= needed
+        self.energy_consumed += needed
+        self.say("ANDROID AI: Initiating warp jump. Hold on!")
+        self.warp_active = True
+        self.warp_start = self.t
+        self.timers.push("warp", self.t + WARP_DURATION)
+        self.show_banner(WARP_BANNER, WARP_DURATION)
+        # the next galaxy was prefetched on arrival here; make sure it is on its way
+        idx = (self.galaxy_idx + 1) % len(GALAXY_NAMES)
+        self.universe.prefetch(GALAXY_NAMES[idx])
+        self.warp_target = idx
+        self.emit("warp_start", galaxy=self.galaxy, cost=needed)
+    def finish_warp(self):
+        idx = self.warp_target
+        self.warp_active = False
+        self.warp_target = None
+        # next galaxy and new mission; tasks are drawn here, on the sim thread, so they do
+        # not depend on when the worker finished the galaxy
+        self.galaxy_idx = idx
+        self.galaxy = GALAXY_NAMES[idx]
+        self.missions_completed += 1
+        self.mission = setup_galaxy_mission(self.universe.galaxy(self.galaxy), self.w, self.h, self.rng)
+        self.index_mission()
+        self.prefetch_next()
+        # arrive in the new galaxy's home sector
+        self.sector = SectorMap(idx, self.universe.galaxy_seed(self.galaxy))
+        self.ship_x, self.ship_y = self.w//2, self.h//2
+        self.cam_x = self.cam_y = 0
+        self.show_banner(f"Entering {self.galaxy}...", ENTER_BANNER_TIME)
+        self.emit("mission", galaxy=self.galaxy, tasks=[dict(t) for t in self.mission["tasks"]])
+    def report(self):
+        return {
+            "missions_completed_count": self.missions_completed,
+            "systems_charted": len(self.charted),
+            "current_mission": self.mission["galaxy"],
+            "tasks_status": self.mission["tasks"],
+            "visited_report": self.visited_report,
+            "score": self.score,
+            "distance_traveled_AU": round(self.dist_traveled, 4),
+            "energy_consumed": round(self.energy_consumed, 2),
+            "fuel_remaining": round(self.fuel, 2),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+# Frame composition (everything drawn from Voyage state)
+def draw_markers(win, mission, cam_x=0, cam_y=0):
+    # star systems (mission systems) as markers
+    h, w = win.getmaxyx()
+    for sys in mission["systems"]:
+        x, y = sys.x - cam_x, sys.y - cam_y
+        if not (-4 <= x < w and -5 <= y < h): continue   # scrolled out of view
+        # marker changes if threat present
+        color = 5 if sys.threat else 3
+        safe_addstr(win, y, x, "◎", color)
+        # small label truncated if too long
+        safe_addstr(win, y+1, max(0, x - 4), sys.name[:12], 1)
+        # draw planet art near system if nearby screen edge permits
+        # only draw first planet art small
+        try:
+            art = sys.planets[0].art
+            for i, line in enumerate(art):
+                safe_addstr(win, y+2+i, max(0, x - len(line)//2), line, 2)
+        except Exception:
+            pass
+def draw_sector(win, sim, cam_x, cam_y):
+    # background sector systems: hollow until charted
+    h, w = win.getmaxyx()
+    sector, charted = sim.sector, sim.charted
+    for c, i, x, y in sector.systems_in(cam_x, cam_y, cam_x + w, cam_y + h):
+        if sector.system_id(c, i) in charted:
+            safe_addstr(win, y - cam_y, x - cam_x, "●", 1)
+        else:
+            safe_addstr(win, y - cam_y, x - cam_x, "○", 2)
+def draw_mission_panel(win, mission):
+    # side panel mission brief
+    h, w = win.getmaxyx()
+    panel_w = min(42, max(28, w//3))
+    panel_h = 8
+    panel_x = max(2, w - panel_w - 2)
+    panel_top = 2
+    draw_box(win, panel_top, panel_x, panel_w, panel_h, title="MISSION", col=2)
+    safe_addstr(win, panel_top+1, panel_x+2, f"Galaxy: {mission['galaxy']}"[:panel_w-4], 3)
+    safe_addstr(win, panel_top+2, panel_x+2, f"Assigned by: {mission.get('assigned_by','Earth')}"[:panel_w-4], 1)
+    # tasks list (trimmed)
+    for i, t in enumerate(mission["tasks"][:3]):
+        status = "✓" if t["done"] else " "
+        safe_addstr(win, panel_top+3+i, panel_x+2, f"[{status}] {t['task']} @ {t['system']}"[:panel_w-4], 3 if t["done"] else 1)
+def draw_galaxy_map(win, visited_report):
+    h, w = win.getmaxyx()
+    map_w = min(36, w//4)
+    map_h = min(8, h//4)
+    draw_box(win, h - map_h - 4, 2, map_w, map_h, title="GALAXY MAP", col=2)
+    for i, name in enumerate(GALAXY_NAMES[:map_h-2]):
+        mark = "✅" if visited_report.get(name, {}).get("systems") else "  "
+        safe_addstr(win, h - map_h - 3 + i, 4, f"{mark} {name}"[:map_w-4], 3)
+def draw_instructions(win):
+    h, w = win.getmaxyx()
+    safe_addstr(win, h-1, 2, "(Arrows/WASD move, X=scan, Z=warp, P=pickup, O=autopilot, B=braille, G=GALAXY MAP, I=AI Hints , Q=quit)", 2)
+def draw_braille(win, cells, dots, near, warp=False):
+    """
+    Draws rasterized stars (see the engines' raster()) as Braille glyphs coloured by the
+    nearest star in each cell: one put() per row onto a FrameBuffer, else one addstr per run.
+    """
+    h, w = win.getmaxyx()
+    attrs = [pair_attr(2 if warp else c) for c in STAR_COLS] + [0]
+    for y, row in itertools.groupby(zip(cells, dots, near), key=lambda c: c[0] // w):
+        row = list(row)
+        x0 = row[0][0] - y*w
+        span = row[-1][0] - y*w - x0 + 1
+        rc, ra = [" "]*span, [0]*span
+        for cell, bits, b in row:
+            rc[cell - y*w - x0] = chr(0x2800 + bits)
+            ra[cell - y*w - x0] = attrs[b]
+        if isinstance(win, FrameBuffer):
+            win.put(y, x0, rc, ra)
+            continue
+        i = 0
+        for a, run in itertools.groupby(ra):
+            n = len(list(run))
+            if a:
+                try:
+                    win.addstr(y, x0 + i, "".join(rc[i:i+n]), a)
+                except curses.error:
+                    pass
+            i += n
+def draw_frame(win, sim, prof=NULL_PROFILER, show_perf=False, alpha=1.0, layers=NULL_LAYERS):
+    h, w = win.getmaxyx()
+    mission = sim.mission
+    # stars
+    if sim.braille:
+        draw_braille(win, *sim.stars.raster(w, h, alpha), sim.warp_active)
+    else:
+        for sx, sy, ch, col in sim.stars.project(w, h, alpha):
+            if sim.warp_active:
+                safe_addstr(win, sy, sx, "|", 2)
+            else:
+                safe_addstr(win, sy, sx, ch, col)
+    prof.lap("stars.draw")
+    # galaxy sprites
+    odo = sim.prev_sprite_odo + (sim.sprite_odo - sim.prev_sprite_odo) * alpha
+    for g in sim.galaxy_sprites:
+        gz = g.z(odo)
+        gx = int((w//2) + (g.x / gz) * (min(w,h)/2))
+        gy = int((h//2) + (g.y / gz) * (min(w,h)/4))
+        for i, line in enumerate(g.art):
+            safe_addstr(win, gy+i, gx, line, 4)
+    prof.lap("sprites.draw")
+    # markers, mission panel, map and instructions only change with the mission, a finished
+    # task or the window size, so they are cached layers keyed on sim.static_version
+    cam = (sim.cam_x, sim.cam_y)
+    # (a warp replaces the sector map, and bumps static_version, so both are in the key)
+    layers.blit(win, "sector", (sim.static_version, sim.sector.version, cam), draw_sector, sim, *cam)
+    layers.blit(win, "markers", (sim.static_version, cam), draw_markers, mission, *cam)
+    prof.lap("markers")
+    # draw power packs (pulse)
+    sym = "⚡" if sim.lod < LOD_PULSE_MIN or int(sim.t*2) % 2 == 0 else "*"
+    for pp in sim.power_packs:
+        safe_addstr(win, pp.y - sim.cam_y, pp.x - sim.cam_x, sym, 3)
+    prof.lap("packs.draw")
+    # draw ship (centered) - use distinct color from planets (magenta)
+    for i, line in enumerate(sim.ship_art):
+        safe_addstr(win, sim.ship_y - sim.cam_y + i, sim.ship_x - sim.cam_x, line, 4)
+
+    # HUD - Galaxy, Target Star-System (nearest undone task), Fuel, Score
+    if sim.autopilot:
+        stop = sim.autopilot.target(sim)
+        target_text = f"AUTO {stop[1]} ({stop[0]:.0f})" if stop else "AUTO -"
+    else:
+        target = sim.nearest_target()
+        target_text = f"{target[1].name} ({target[0]:.0f})" if target else "None"
+    hud_y = 0
+    safe_addstr(win, hud_y, 2, f"Galaxy: {sim.galaxy}", 2)
+    safe_addstr(win, hud_y, 28, f"Target: {target_text}", 3)
+    # fuel bar
+    fuel_pct = sim.fuel / FUEL_MAX
     try:
-        curses.init_pair(6, curses.COLOR_BLUE, -1)
+        bar_len = int(fuel_pct * 24)
+        bar = "[" + "█"*bar_len + " "*(24-bar_len) + "]"
+        safe_addstr(win, hud_y+1, 2, f"Fuel: {bar} {int(sim.fuel)}", 3)
+    except Exception:
+        safe_addstr(win, hud_y+1, 2, f"Fuel: {int(sim.fuel)}", 3)
+    # score and distance
+    safe_addstr(win, hud_y, max(0,w-36), f"Score: {sim.score}", 3)
+    safe_addstr(win, hud_y+1, max(0,w-36), f"Dist: {sim.dist_traveled:.3f} AU", 4)
+    # energy consumed display smaller
+    safe_addstr(win, hud_y+2, max(0,w-36), f"Energy used: {int(sim.energy_consumed)}", 1)
+
+    # persistent crew logs (left-top, below HUD)
+    try:
+        max_logs = 3
+        for i, line in enumerate(sim.crew_logs[:max_logs]):
+            # clamp length to avoid overlapping right-side panels
+            max_len = max(20, min(48, (w//2) - 4))
+            safe_addstr(win, hud_y+3 + i, 2, line[:max_len], 3)
     except Exception:
-        # some terminals may not support all colors; ignore failures
         pass
+    # effective density: stars actually simulated after adaptive level of detail
+    active, total = sim.stars.active, len(sim.stars)
+    stars = f"Stars: {active}" if active == total else f"Stars: {active}/{total} (LOD {sim.lod:.0%})"
+    sector = f"Sector {sim.ship_x // SECTOR_CHUNK_W:+d},{sim.ship_y // SECTOR_CHUNK_H:+d}"
+    safe_addstr(win, hud_y+2, 2, f"{stars}  {sector}  Charted: {len(sim.charted)}", 1)
+    if show_perf:
+        layers.blit(win, "perf", int(sim.t * PERF_OVERLAY_HZ * sim.lod), draw_perf_overlay, prof, w)
+    prof.lap("hud")
 
-    random.seed()
-    # state
-    speed = max(MIN_SPEED, min(MAX_SPEED, init_speed))
-    visual_speed = min(speed, VISUAL_SPEED_CAP)
-    density = max(30, density)
-    h,w = stdscr.getmaxyx()
-    stars = [Star(w,h) for _ in range(density)]
-    galaxy_sprites = deque()
-    power_packs = []
-    cur_galaxy_idx = random.randrange(len(GALAXY_NAMES))
-    cur_galaxy = GALAXY_NAMES[cur_galaxy_idx]
-    # set up mission for current galaxy
-    mission = setup_galaxy_mission(cur_galaxy, w, h)
-    missions_completed = []
-    visited_report = {name: {"type": GALAXY_DB[name]["type"], "systems": []} for name in GALAXY_NAMES}
-    score = 0
-    fuel = FUEL_MAX
-    energy_consumed = 0.0
-    dist_traveled = 0.0
-    show_ai = False
-    show_map = False
-    show_missions = False
-    show_log = False
-    copilot_msg = "AI: Systems online. Earth Command standing by."
-    copilot_timer = 0.0
-    crew_logs = ["Captain's Log: Voyager commissioned.", "Engineer: Fusion cores stable.", "XO: Crew ready."]
-    last_hint_time = 0
-    last_time = time.time()
-    ship_art = random.choice(SHIP_VARIANTS)
-    ship_x = w//2
-    ship_y = h//2
-    warp_active = False
-    warp_start = 0.0
-
-    # SPLASH - Mission objectives from Earth Command
-    def splash_screen(win, mission):
-        win.nodelay(False)
-        win.erase()
-        hh, ww = win.getmaxyx()
-        heading = "VOYAGER - Galactic Odyssey" 
-        hb_w = min(ww - 4, max(len(heading) + 6, 30))
-        hb_left = max(2, (ww - hb_w) // 2)
-        hb_top = max(1, hh//2 - 30)
-        draw_box(win, hb_top, hb_left, hb_w, 3, title=None, col=5)
-        safe_addstr(win, hb_top + 1, hb_left + (hb_w - len(heading)) // 2, heading, 5)
-        title = "EARTH COMMAND - MISSION BRIEF"
-        safe_addstr(win, max(1,hh//2 - 15), max(0,(ww - len(title))//2), title, 2)
-        lines = [
-            f"Hello! Commander of the Voyager",
-            "",
-            f"Here is your next mission....",
-            "",
-            f"Galaxy: {mission['galaxy']}",
-            "",
-            "Objectives:",
-            ""
-        ]
-        for t in mission["tasks"]:
-            lines.append(f" - {t['task']} @ {t['system']} (Reward: {t['reward']})")
-        lines.append("")
-        lines.append("Press any key to accept mission and commence launch...")
-        top = max(3, hh//2 - len(lines))
-        for i, L in enumerate(lines):
-            x = max(4, (ww - 60)//2)
-            text = L[:60]
-            
-            if text.strip().startswith("Press any key"):
-                # Show the prompt in bold blue 
-                safe_addstr(win, top + i, x, text, 6, curses.A_BOLD)
-            else:
-                safe_addstr(win, top + i, x, text, 3 if i>1 else 1)
-        win.refresh()
-        win.getch()
-        win.erase(); win.refresh()
-        win.nodelay(True)
+    layers.blit(win, "mission", sim.static_version, draw_mission_panel, mission)
+    panel_top, panel_h = 2, 8   # the AI box sits below the mission panel
 
-    # Show splash 
-    splash_screen(stdscr, mission)
-    safe_addstr(stdscr, h//2, max(0,(w - 40)//2), f"Entering {cur_galaxy}... {random.choice(['Be vigilant.','Good luck, Captain.'])}", 3)
-    stdscr.refresh(); time.sleep(1.0)
-
-    running = True
-    while running:
-        now = time.time()
-        dt = now - last_time if last_time else 0.033
-        last_time = now
-
-        h,w = stdscr.getmaxyx()
-        stdscr.erase()
-        if h < 20 or w < 70:
-            safe_addstr(stdscr, 1, 2, "Terminal too small — resize to at least 70x20", 5)
-            safe_addstr(stdscr, 3, 2, "Press Q to quit.", 3)
-            stdscr.refresh()
-            try:
-                k = stdscr.getch()
-                if k in (ord('q'), ord('Q'), 27):
-                    running = False
-            except Exception:
-                pass
-            time.sleep(0.3)
-            continue
+    # AI Hints
+    if sim.show_ai:
+        ai_w = min(48, w - 8)
+        draw_box(win, panel_top + panel_h + 1, 2, ai_w, 4, title="AI", col=2)
+        safe_addstr(win, panel_top + panel_h + 2, 4, sim.copilot_msg[:ai_w-6], 4)
 
-        # input handling
-        try:
-            k = stdscr.getch()
-        except Exception:
-            k = -1
-        moved = False
-        if k != -1:
-            if k in (ord('q'), ord('Q'), 27):
-                running = False; break
-            elif k in (curses.KEY_LEFT, ord('a'), ord('A')):
-                ship_x = max(2, ship_x - 1); moved = True
-            elif k in (curses.KEY_RIGHT, ord('d'), ord('D')):
-                ship_x = min(w - SHIP_VARIANTS[0].__len__() - 2, ship_x + 1); moved = True
-            elif k in (curses.KEY_UP, ord('w'), ord('W')):
-                ship_y = max(2, ship_y - 1); moved = True
-            elif k in (curses.KEY_DOWN, ord('s'), ord('S')):
-                ship_y = min(h- SHIP_VARIANTS[0].__len__() - 3, ship_y + 1); moved = True
-            elif k in (ord('+'), ord('=')):
-                speed = min(MAX_SPEED, speed + 0.2)
-            elif k in (ord('-'), ord('_')):
-                speed = max(MIN_SPEED, speed - 0.2)
-            elif k in (ord('i'), ord('I')):
-                show_ai = not show_ai
-            elif k in (ord('g'), ord('G')):
-                show_map = not show_map
-            elif k in (ord('l'), ord('L')):
-                show_log = True
-            elif k in (ord('p'), ord('P')):
-                # pick up power pack if near
-                picked = None
-                for pp in power_packs:
-                    if abs(pp.x - ship_x) <= POWER_COLLECT_RADIUS and abs(pp.y - ship_y) <= POWER_COLLECT_RADIUS:
-                        picked = pp; break
-                if picked:
-                    try: power_packs.remove(picked)
-                    except Exception: pass
-                    score += 100
-                    fuel = min(FUEL_MAX, fuel + 60.0)
-                    energy_consumed += FUEL_CONSUMPTION_PICK
-                    copilot_msg = "ANDROID AI: Power cache secured. Energy redistributed."
-                    copilot_timer = now
-            elif k in (ord('s'),):  # lowercase s handled by movement, detect uppercase 'S' as ord('S')
-                # handled above; to implement scanning we map capital 'X' to Scan to avoid conflict
-                pass
-            elif k in (ord('S'),):  # likely not seen by curses; include scan mapping to space and 'x'
-                pass
-            elif k in (ord('x'), ord('X'), ord(' ')):  # scan / sample
-                # find nearest star system within radius; iterate systems
-                performed = False
-                for sys in mission["systems"]:
-                    # use Euclidean distance so scan reaches in a radius around the ship
-                    dx = sys.x - ship_x
-                    dy = sys.y - ship_y
-                    if math.hypot(dx, dy) <= SCAN_RADIUS:
-                        # consume fuel and do task if any tasks target this system
-                        if fuel >= FUEL_CONSUMPTION_SCAN:
-                            fuel -= FUEL_CONSUMPTION_SCAN
-                            energy_consumed += FUEL_CONSUMPTION_SCAN
-                            # reveal history and possibly mark tasks
-                            # check tasks in mission
-                            for t in mission["tasks"]:
-                                if t["system"] == sys.name and not t["done"]:
-                                    t["done"] = True
-                                    reward = t.get("reward", TASK_REWARD_BASE)
-                                    score += reward
-                                    copilot_msg = f"ANDROID AI: Task '{t['task']}' completed at {sys.name}. +{reward} pts."
-                                    copilot_timer = now
-                                    performed = True
-                                    # record visited
-                                    visited_report[cur_galaxy]["systems"].append({"system": sys.name, "task": t["task"]})
-                                    break
-                            if not performed:
-                                # generic scan: small reward for discovering info
-                                score += 20
-                                copilot_msg = f"ANDROID AI: Scanned {sys.name}. {sys.history}"
-                                copilot_timer = now
-                                performed = True
-                        else:
-                            copilot_msg = "ANDROID AI: Insufficient fuel to scan."
-                            copilot_timer = now
-                        break
-                if not performed:
-                    copilot_msg = "ANDROID AI: No nearby system to scan. Move closer to a star-system marker."
-                    copilot_timer = now
-            elif k in (ord('z'), ord('Z')):  
-                # manual warp: consume big fuel and teleport to next galaxy (if fuel)
-                needed = FUEL_CONSUMPTION_MOVE * WARP_FUEL_MULT * 4.0
-                if fuel >= needed:
-                    fuel -= needed
-                    energy_consumed += needed
-                    copilot_msg = "ANDROID AI: Initiating warp jump. Hold on!"
-                    copilot_timer = now
-                    warp_cinematic(stdscr, duration=WARP_DURATION)
-                    # next galaxy and new mission
-                    cur_galaxy_idx = (cur_galaxy_idx + 1) % len(GALAXY_NAMES)
-                    cur_galaxy = GALAXY_NAMES[cur_galaxy_idx]
-                    # save current mission if any tasks done
-                    missions_completed.append(mission)
-                    mission = setup_galaxy_mission(cur_galaxy, w, h)
-                    # brief entering text
-                    safe_addstr(stdscr, h//2, max(0,(w - 40)//2), f"Entering {cur_galaxy}...", 3)
-                    stdscr.refresh(); time.sleep(0.9)
-                else:
-                    copilot_msg = "ANDROID AI: Not enough fuel for warp."
-                    copilot_timer = now
-        # fuel consumption while moving (approx based on dt)
-        # if ship moved in this frame, consume more; but to simplify, we drain per second
-        movement_fuel = FUEL_CONSUMPTION_MOVE * dt * (1 + max(0.0, speed - 1.0))
-        fuel = max(0.0, fuel - movement_fuel)
-        energy_consumed += movement_fuel
+    # mini map
+    if sim.show_map:
+        layers.blit(win, "map", sim.static_version, draw_galaxy_map, sim.visited_report)
 
-        # distance metric (use speed * dt)
-        dist_traveled += speed * dt * 0.08
+    # crew log popup (shown for a single frame per key press)
+    if sim.show_log:
+        lg_w = min(64, w-8)
+        lg_h = 6
+        lg_left = max(4, (w - lg_w) // 2)
+        lg_top = max(3, (h - lg_h) // 2)
+        draw_box(win, lg_top, lg_left, lg_w, lg_h, title="CREW LOG", col=2)
+        for i, line in enumerate(sim.crew_logs):
+            safe_addstr(win, lg_top+1+i, lg_left+2, line[:lg_w-4], 3)
+        sim.show_log = False
 
-        # spawn powerpacks occasionally
-        if random.random() < POWER_SPAWN_CHANCE:
-            px = random.randint(6, max(6, w-8))
-            py = random.randint(4, max(4, h-6))
-            power_packs.append(PowerPack(px, py))
-
-        # star visuals update (use visual_speed cap)
-        visual_speed = min(speed, VISUAL_SPEED_CAP)
-        for s in stars:
-            if not s.step(visual_speed, dt):
-                s.reset(w,h, False)
-            sx = int((w//2) + (s.x / s.z) * (min(w,h)/2))
-            sy = int((h//2) + (s.y / s.z) * (min(w,h)/4))
-            if 0 <= sx < w and 0 <= sy < h:
-                if warp_active:
-                    safe_addstr(stdscr, sy, sx, "|", 2)
-                else:
-                    safe_addstr(stdscr, sy, sx, s.ch, s.col)
+    # warp / arrival banner
+    if sim.banner:
+        text = sim.banner[0]
+        safe_addstr(win, h//2, max(0,(w - len(text))//2), text, 3)
 
-        # occasionally show galaxy sprite
-        if random.random() < 0.0009:
-            gal_art = GALAXY_DB[cur_galaxy]["art"]
-            galaxy_sprites.append(GalaxySprite(cur_galaxy, gal_art, w, h))
-        for _ in range(len(galaxy_sprites)):
-            g = galaxy_sprites.popleft()
-            if g.step(visual_speed, dt):
-                gx = int((w//2) + (g.x / g.z) * (min(w,h)/2))
-                gy = int((h//2) + (g.y / g.z) * (min(w,h)/4))
-                for i, line in enumerate(g.art):
-                    safe_addstr(stdscr, gy+i, gx, line, 4)
-                galaxy_sprites.append(g)
-
-        # draw star systems (mission systems) as markers
-        for sys in mission["systems"]:
-            # marker changes if threat present
-            color = 5 if sys.threat else 3
-            safe_addstr(stdscr, sys.y, sys.x, "◎", color)
-            # small label truncated if too long
-            safe_addstr(stdscr, sys.y+1, max(0, sys.x - 4), sys.name[:12], 1)
-            # draw planet art near system if nearby screen edge permits
-            # only draw first planet art small
+    # instructions
+    layers.blit(win, "instructions", None, draw_instructions)
+    prof.lap("panels")
+
+# SPLASH - Mission objectives from Earth Command
+def splash_screen(win, mission):
+    hh, ww = win.getmaxyx()
+    heading = "VOYAGER - Galactic Odyssey" 
+    hb_w = min(ww - 4, max(len(heading) + 6, 30))
+    hb_left = max(2, (ww - hb_w) // 2)
+    hb_top = max(1, hh//2 - 30)
+    draw_box(win, hb_top, hb_left, hb_w, 3, title=None, col=5)
+    safe_addstr(win, hb_top + 1, hb_left + (hb_w - len(heading)) // 2, heading, 5)
+    title = "EARTH COMMAND - MISSION BRIEF"
+    safe_addstr(win, max(1,hh//2 - 15), max(0,(ww - len(title))//2), title, 2)
+    if mission is None:
+        # first frame: the voyage is still being prepared behind it
+        text = "Receiving mission brief from Earth Command..."
+        safe_addstr(win, hh//2, max(0,(ww - len(text))//2), text, 3)
+        return
+    lines = [
+        f"Hello! Commander of the Voyager",
+        "",
+        f"Here is your next mission....",
+        "",
+        f"Galaxy: {mission['galaxy']}",
+        "",
+        "Objectives:",
+        ""
+    ]
+    for t in mission["tasks"]:
+        lines.append(f" - {t['task']} @ {t['system']} (Reward: {t['reward']})")
+    lines.append("")
+    lines.append("Press any key to accept mission and commence launch...")
+    top = max(3, hh//2 - len(lines))
+    for i, L in enumerate(lines):
+        x = max(4, (ww - 60)//2)
+        text = L[:60]
+        
+        if text.strip().startswith("Press any key"):
+            # Show the prompt in bold blue 
+            safe_addstr(win, top + i, x, text, 6, curses.A_BOLD)
+        else:
+            safe_addstr(win, top + i, x, text, 3 if i>1 else 1)
+
+# Output backends: where composed frames go and where keys come from
+PALETTE = {1: "GREEN", 2: "CYAN", 3: "YELLOW", 4: "MAGENTA", 5: "RED", 6: "BLUE"}   # colour pair -> colour
+ANSI_COLORS = ("BLACK", "RED", "GREEN", "YELLOW", "BLUE", "MAGENTA", "CYAN", "WHITE")
+class CursesBackend:
+    """The curses screen: diffs are written with addstr and curses refreshes the terminal."""
+    def __init__(self, stdscr):
+        self.win = stdscr
+        curses.curs_set(0)
+        stdscr.nodelay(True)
+        stdscr.keypad(True)
+        curses.start_color()
+        curses.use_default_colors()
+        for pair, name in PALETTE.items():
             try:
-                art = sys.planets[0].art
-                for i, line in enumerate(art):
-                    safe_addstr(stdscr, sys.y+2+i, max(0, sys.x - len(line)//2), line, 2)
+                curses.init_pair(pair, getattr(curses, "COLOR_" + name), -1)
             except Exception:
+                # some terminals may not support all colors; ignore failures
                 pass
-
-        # draw power packs (pulse)
-        for pp in power_packs[:]:
-            if time.time() - pp.t0 > POWER_LIFE:
-                try: power_packs.remove(pp)
-                except Exception: pass
-                continue
-            sym = "⚡" if int(time.time()*2) % 2 == 0 else "*"
-            safe_addstr(stdscr, pp.y, pp.x, sym, 3)
-
-        # draw ship (centered) - use distinct color from planets (magenta)
-        for i, line in enumerate(ship_art):
-            safe_addstr(stdscr, ship_y + i, ship_x, line, 4)
-
-        # HUD - Galaxy, Target Star-System (nearest undone task), Fuel, Score
-        # find next task target
-        next_task = None
-        for t in mission["tasks"]:
-            if not t["done"]:
-                next_task = t; break
-        target_text = next_task["system"] if next_task else "None"
-        hud_y = 0
-        safe_addstr(stdscr, hud_y, 2, f"Galaxy: {cur_galaxy}", 2)
-        safe_addstr(stdscr, hud_y, 28, f"Target: {target_text}", 3)
-        # fuel bar
-        fuel_pct = fuel / FUEL_MAX
+    def size(self): return self.win.getmaxyx()
+    def read_key(self):
         try:
-            bar_len = int(fuel_pct * 24)
-            bar = "[" + "█"*bar_len + " "*(24-bar_len) + "]"
-            safe_addstr(stdscr, hud_y+1, 2, f"Fuel: {bar} {int(fuel)}", 3)
+            return self.win.getch()
         except Exception:
-            safe_addstr(stdscr, hud_y+1, 2, f"Fuel: {int(fuel)}", 3)
-        # score and distance
-        safe_addstr(stdscr, hud_y, max(0,w-36), f"Score: {score}", 3)
-        safe_addstr(stdscr, hud_y+1, max(0,w-36), f"Dist: {dist_traveled:.3f} AU", 4)
-        # energy consumed display smaller
-        safe_addstr(stdscr, hud_y+2, max(0,w-36), f"Energy used: {int(energy_consumed)}", 1)
-
-        # persistent crew logs (left-top, below HUD)
+            return -1
+    def input_fd(self):
         try:
-            max_logs = 3
-            for i, line in enumerate(crew_logs[:max_logs]):
-                # clamp length to avoid overlapping right-side panels
-                max_len = max(20, min(48, (w//2) - 4))
-                safe_addstr(stdscr, hud_y+3 + i, 2, line[:max_len], 3)
-        except Exception:
+            return sys.stdin.fileno()
+        except (AttributeError, ValueError, OSError):
+            return None
+    def clear(self): self.win.erase()
+    def present(self, buf):
+        buf.flush(self.win)
+        self.win.refresh()
+class AnsiBackend:
+    """
+    Raw terminal output: each frame's changed runs become one byte string (cursor moves
+    elided or shortened, SGR only when the attribute changes) written with a single write().
+    Keys are read from stdin in cbreak mode. Use as a context manager to restore the tty.
+    """
+    KEYS = {"[A": curses.KEY_UP, "[B": curses.KEY_DOWN, "[C": curses.KEY_RIGHT, "[D": curses.KEY_LEFT,
+            "OA": curses.KEY_UP, "OB": curses.KEY_DOWN, "OC": curses.KEY_RIGHT, "OD": curses.KEY_LEFT}
+    SCAN_KEYS = {"H": "\x1b[A", "P": "\x1b[B", "M": "\x1b[C", "K": "\x1b[D"}   # msvcrt arrow scan codes
+    def __init__(self, out_fd=None, interactive=True):
+        self.fd = sys.stdout.fileno() if out_fd is None else out_fd
+        self.interactive = interactive
+        self.in_fd = sys.stdin.fileno() if interactive else None
+        self.saved_tty = None
+        self.pending = deque()
+        self._sgr = {}
+        self.bytes_written = 0
+        self.writes = 0
+    def __enter__(self):
+        if self.interactive:
+            if termios:
+                self.saved_tty = termios.tcgetattr(self.in_fd)
+                tty.setcbreak(self.in_fd)
+            elif os.name == "nt":
+                os.system("")   # enables VT escape processing on Windows 10+ consoles
+            # alternate screen, hidden cursor, no autowrap (the bottom-right cell must not scroll)
+            self._write("\x1b[?1049h\x1b[?25l\x1b[?7l\x1b[2J")
+        return self
+    def __exit__(self, *exc):
+        if self.interactive:
+            self._write("\x1b[0m\x1b[?7h\x1b[?25h\x1b[?1049l")
+            if self.saved_tty is not None:
+                termios.tcsetattr(self.in_fd, termios.TCSADRAIN, self.saved_tty)
+        return False
+    def size(self):
+        try:
+            cols, rows = os.get_terminal_size(self.fd)
+        except OSError:
+            cols, rows = 120, 40
+        return rows, cols
+    def _write(self, text):
+        data = text.encode("utf-8")
+        self.bytes_written += len(data)
+        self.writes += 1
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+    def _read(self, timeout):
+        """Input that arrives within `timeout` seconds (None: wait for it); '' if there is none."""
+        if termios:
+            if not select.select([self.in_fd], [], [], timeout)[0]: return ""
+            return os.read(self.in_fd, 64).decode("utf-8", "replace")
+        import msvcrt
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not msvcrt.kbhit():
+            if deadline is not None and time.monotonic() >= deadline: return ""
+            time.sleep(0.01)
+        raw = ""
+        while msvcrt.kbhit():
+            ch = msvcrt.getwch()
+            # special keys arrive as a 0x00/0xE0 prefix and a scan code: arrows become their VT sequence
+            raw += self.SCAN_KEYS.get(msvcrt.getwch(), "") if ch in "\x00\xe0" else ch
+        return raw
+    @staticmethod
+    def _seq_end(raw, i):
+        """End of the escape sequence at raw[i]: CSI (ESC [ params final) or SS3 (ESC O x); None if cut short."""
+        if i + 1 >= len(raw): return None
+        if raw[i+1] == "O": return i + 3 if i + 2 < len(raw) else None
+        if raw[i+1] != "[": return i + 1   # ESC + key (Alt): the key is read on its own
+        for j in range(i + 2, len(raw)):
+            if "\x40" <= raw[j] <= "\x7e": return j + 1
+        return None
+    def _fill(self, timeout):
+        raw = self._read(timeout)
+        i = 0
+        while i < len(raw):
+            if raw[i] != "\x1b":
+                self.pending.append(ord(raw[i]))
+                i += 1
+                continue
+            # a sequence split across reads is completed first; ESC with nothing after it is the quit key
+            end = self._seq_end(raw, i)
+            while end is None:
+                more = self._read(ESC_DELAY)
+                if not more: break
+                raw += more
+                end = self._seq_end(raw, i)
+            if end is None:
+                if i + 1 == len(raw): self.pending.append(27)
+                return   # a sequence cut short is dropped
+            key = self.KEYS.get(raw[i+1:end])
+            if key: self.pending.append(key)   # Home, F1, Ctrl+arrows, ...: not game keys
+            i = end
+    def read_key(self):
+        if not self.interactive: return -1
+        if not self.pending: self._fill(0)
+        return self.pending.popleft() if self.pending else -1
+    def input_fd(self): return self.in_fd
+    def clear(self):
+        self._write("\x1b[0m\x1b[2J")
+    def sgr(self, attr):
+        seq = self._sgr.get(attr)
+        if seq is None:
+            codes = ["0"]
+            if attr & curses.A_BOLD: codes.append("1")
+            if attr & curses.A_DIM: codes.append("2")
+            if attr & curses.A_BLINK: codes.append("5")
+            if attr & curses.A_REVERSE: codes.append("7")
+            name = PALETTE.get((attr & curses.A_COLOR) >> 8)
+            if name: codes.append(str(30 + ANSI_COLORS.index(name)))
+            seq = self._sgr[attr] = "\x1b[" + ";".join(codes) + "m"
+        return seq
+    def present(self, buf):
+        out = []
+        cy = cx = -1
+        cur = None
+        for y, x, text, attr in buf.diff():
+            if y != cy or x != cx:
+                # same row, further right: a short relative move instead of an absolute one
+                out.append(f"\x1b[{x - cx}C" if y == cy and x > cx else f"\x1b[{y+1};{x+1}H")
+            if attr != cur:
+                out.append(self.sgr(attr))
+                cur = attr
+            out.append(text)
+            cy, cx = y, x + (len(text) if text.isascii() else sum(map(cell_width, text)))
+        if out: self._write("".join(out))
+class NullBackend:
+    """Discards frames after diffing them (benchmarks); counts runs and characters."""
+    def __init__(self, h, w):
+        self.h, self.w = h, w
+        self.calls = 0
+        self.chars = 0
+    def size(self): return self.h, self.w
+    def read_key(self): return -1
+    def input_fd(self): return None
+    def clear(self): pass
+    def present(self, buf):
+        for _, _, text, _ in buf.diff():
+            self.calls += 1
+            self.chars += len(text)
+BACKENDS = ("curses", "ansi")
+
+# Input pump: keys are drained into a queue as they arrive, not once per frame
+class InputPump:
+    """
+    Moves every pending key from the backend into an asyncio.Queue whenever stdin becomes
+    readable (loop.add_reader), or every 1/INPUT_POLL_HZ seconds where the event loop cannot
+    watch it. take() drains once more, so curses also gets to process resizes each tick.
+    """
+    def __init__(self, backend):
+        self.backend = backend
+        self.keys = asyncio.Queue()
+        self.fd = None
+        self.poller = None
+    def start(self):
+        loop = asyncio.get_running_loop()
+        fd = self.backend.input_fd()
+        if fd is not None:
+            try:
+                loop.add_reader(fd, self.drain)
+                self.fd = fd
+                return
+            except (NotImplementedError, ValueError, OSError):
+                pass   # e.g. the Windows proactor loop: fall back to polling
+        self.poller = loop.create_task(self.poll())
+    def stop(self):
+        if self.fd is not None:
+            asyncio.get_running_loop().remove_reader(self.fd)
+            self.fd = None
+        if self.poller:
+            self.poller.cancel()
+            self.poller = None
+    def drain(self):
+        while True:
+            k = self.backend.read_key()
+            if k == -1: return
+            self.keys.put_nowait(k)
+    async def poll(self):
+        while True:
+            self.drain()
+            await asyncio.sleep(1.0 / INPUT_POLL_HZ)
+    def take(self):
+        """Every key that arrived since the last call, oldest first."""
+        self.drain()
+        out = []
+        while not self.keys.empty():
+            out.append(self.keys.get_nowait())
+        return out
+    async def get(self, timeout=None):
+        """The next key, waiting on the event loop; -1 after `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.keys.get(), timeout)
+        except asyncio.TimeoutError:
+            return -1
+
+# Spectators: rendered frames published as compressed cell diffs over a Unix socket
+SPEC_FRAME, SPEC_END = 1, 2
+_SPEC_MSG = struct.Struct("<BI")     # kind, payload length
+_SPEC_HEAD = struct.Struct("<HHI")   # frame rows, columns, number of runs
+_SPEC_RUN = struct.Struct("<HHIH")   # y, x, attr, text length in bytes
+def encode_frame(h, w, runs):
+    parts = [_SPEC_HEAD.pack(h, w, len(runs))]
+    for y, x, text, attr in runs:
+        b = text.encode("utf-8")
+        parts.append(_SPEC_RUN.pack(y, x, attr, len(b)))
+        parts.append(b)
+    payload = zlib.compress(b"".join(parts), 1)
+    return _SPEC_MSG.pack(SPEC_FRAME, len(payload)) + payload
+def decode_frame(payload):
+    data = zlib.decompress(payload)
+    h, w, n = _SPEC_HEAD.unpack_from(data)
+    pos, runs = _SPEC_HEAD.size, []
+    for _ in range(n):
+        y, x, attr, size = _SPEC_RUN.unpack_from(data, pos)
+        pos += _SPEC_RUN.size
+        runs.append((y, x, data[pos:pos+size].decode("utf-8"), attr))
+        pos += size
+    return h, w, runs
+def frame_runs(chars, attrs):
+    # a whole frame as runs of equal attribute (keyframe for joining or lagging spectators)
+    runs = []
+    for y, (rc, ra) in enumerate(zip(chars, attrs)):
+        x = 0
+        for a, cells in itertools.groupby(zip(rc, ra), key=lambda c: c[1]):
+            cells = [c for c, _ in cells]
+            runs.append((y, x, "".join(cells), a))
+            x += len(cells)
+    return runs
+class _Spectator:
+    __slots__ = ("writer", "queue", "ready", "sent", "acked", "task")
+    def __init__(self, writer):
+        self.writer = writer
+        self.queue = deque()
+        self.ready = asyncio.Event()
+        self.sent = self.acked = 0    # frames written / acknowledged by the viewer
+        self.task = asyncio.current_task()
+class SpectatorBroadcast:
+    """
+    Wraps a backend: every frame it presents is also published to read-only spectators on a
+    Unix socket, encoded once as the frame's changed runs. Viewers acknowledge each frame
+    and at most SPECTATOR_QUEUE may be unacknowledged (socket buffers would otherwise hide
+    the lag); once as many are queued behind those, the queue is replaced by one full frame,
+    so a slow viewer skips ahead instead of stalling the game or falling ever further behind.
+    """
+    def __init__(self, backend, path=SPECTATOR_SOCKET):
+        self.backend = backend
+        self.path = path
+        self.server = None
+        self.buf = None
+        self.clients = set()
+        self.closing = False
+        self.sent = self.resyncs = 0
+    def __getattr__(self, name):
+        return getattr(self.backend, name)   # size, read_key, input_fd, clear
+    async def start(self):
+        try:
+            if stat.S_ISSOCK(os.stat(self.path).st_mode): os.unlink(self.path)   # left by a crashed run
+        except OSError:
             pass
+        self.server = await asyncio.start_unix_server(self._accept, self.path)
+    def _keyframe(self):
+        buf = self.buf
+        if buf is None or buf.prev_chars is None: return None
+        return encode_frame(buf.h, buf.w, frame_runs(buf.prev_chars, buf.prev_attrs))
+    async def _acks(self, c, reader):
+        while True:
+            data = await reader.read(256)
+            if not data: break
+            c.acked += len(data)
+            c.ready.set()
+    async def _accept(self, reader, writer):
+        c = _Spectator(writer)
+        key = self._keyframe()
+        if key: c.queue.append(key)
+        self.clients.add(c)
+        acks = asyncio.ensure_future(self._acks(c, reader))
+        try:
+            while not acks.done():
+                await c.ready.wait()
+                c.ready.clear()
+                while c.queue and c.sent - c.acked < SPECTATOR_QUEUE:
+                    msg = c.queue.popleft()
+                    writer.write(msg)
+                    await writer.drain()
+                    if msg[0] == SPEC_END: return
+                    c.sent += 1
+        except (ConnectionError, OSError):
+            pass   # viewer went away
+        finally:
+            acks.cancel()
+            self.clients.discard(c)
+            writer.close()
+    def present(self, buf):
+        self.backend.present(buf)
+        self.buf = buf
+        if not self.clients: return
+        diff = key = None
+        for c in self.clients:
+            if len(c.queue) >= SPECTATOR_QUEUE:
+                key = key or self._keyframe()
+                c.queue.clear()
+                c.queue.append(key)
+                self.resyncs += 1
+            else:
+                diff = diff or encode_frame(buf.h, buf.w, buf.last_runs)
+                c.queue.append(diff)
+            c.ready.set()
+        self.sent += 1
+    async def close(self, timeout=1.0):
+        # goodbye to every viewer: queued frames are dropped, the end marker jumps the ack window
+        end = _SPEC_MSG.pack(SPEC_END, 0)
+        for c in self.clients:
+            c.queue.clear()
+            c.queue.append(end)
+            c.acked = c.sent
+            c.ready.set()
+        deadline = time.monotonic() + timeout
+        while self.clients and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+        for c in list(self.clients):
+            c.task.cancel()   # stuck viewer: the socket goes away under it
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+async def spectate_async(backend, path=SPECTATOR_SOCKET):
+    """Read-only viewer: mirrors a --broadcast session into this terminal until it ends or Q."""
+    reader, writer = await asyncio.open_unix_connection(path)
+    pump = InputPump(backend)
+    pump.start()
+    mirror = FrameBuffer(1, 1)    # the broadcaster's screen
+    view = FrameBuffer(*backend.size())
+    async def receive():
+        while True:
+            try:
+                kind, size = _SPEC_MSG.unpack(await reader.readexactly(_SPEC_MSG.size))
+                if kind == SPEC_END: return
+                h, w, runs = decode_frame(await reader.readexactly(size))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return   # the game exited without saying goodbye
+            if (h, w) != mirror.getmaxyx(): mirror.resize(h, w)
+            for y, x, text, attr in runs:
+                mirror.addstr(y, x, text, attr)
+            writer.write(b"\x06")   # ack: lets the broadcaster send the next frame
+            vh, vw = backend.size()
+            if (vh, vw) != view.getmaxyx():
+                view.resize(vh, vw)
+                backend.clear()
+            view.erase()
+            for y in range(min(h, vh)):
+                cells = mirror.chars[y][:vw]
+                if cells and cells[-1] and cell_width(cells[-1]) == 2 and len(cells) == vw: cells = cells[:-1] + [" "]
+                view.put(y, 0, cells, mirror.attrs[y][:len(cells)])
+            backend.present(view)
+    async def quit_key():
+        while await pump.get() not in KEYS_QUIT: pass
+    tasks = [asyncio.ensure_future(receive()), asyncio.ensure_future(quit_key())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for t in done: t.result()
+    finally:
+        for t in tasks: t.cancel()
+        pump.stop()
+        writer.close()
+def spectate(backend, path=SPECTATOR_SOCKET):
+    asyncio.run(spectate_async(backend, path))
 
-        # side panel mission brief
-        panel_w = min(42, max(28, w//3))
-        panel_h = 8
-        panel_x = max(2, w - panel_w - 2)
-        panel_top = 2
-        draw_box(stdscr, panel_top, panel_x, panel_w, panel_h, title="MISSION", col=2)
-        safe_addstr(stdscr, panel_top+1, panel_x+2, f"Galaxy: {mission['galaxy']}"[:panel_w-4], 3)
-        safe_addstr(stdscr, panel_top+2, panel_x+2, f"Assigned by: {mission.get('assigned_by','Earth')}"[:panel_w-4], 1)
-        # tasks list (trimmed)
-        for i, t in enumerate(mission["tasks"][:3]):
-            status = "✓" if t["done"] else " "
-            safe_addstr(stdscr, panel_top+3+i, panel_x+2, f"[{status}] {t['task']} @ {t['system']}"[:panel_w-4], 3 if t["done"] else 1)
-
-        # AI Hints
-        if show_ai:
-            ai_w = min(48, w - 8)
-            draw_box(stdscr, panel_top + panel_h + 1, 2, ai_w, 4, title="AI", col=2)
-            if (now - copilot_timer) < 6.0:
-                safe_addstr(stdscr, panel_top + panel_h + 2, 4, copilot_msg[:ai_w-6], 4)
+# Main run loop
+def open_event_log(path):
+    if not path: return None
+    try:
+        return EventLog(path)
+    except OSError:
+        return None   # logging is best effort, like the report itself
+def forward_events(sim, log):
+    for kind, data in sim.pop_events():
+        if log: log.emit(kind, data)
+def close_event_log(sim, log):
+    if not log: return
+    sim.emit("end")
+    forward_events(sim, log)
+    log.close()
+
+# Record / replay: seed + tick-stamped input stream
+REC_MAGIC = "VOYAGER-REC"
+REC_VERSION = 1
+REC_KEY, REC_RESIZE, REC_END = 0, 1, 2
+_REC = struct.Struct("<IBi")    # tick, kind, value (key code, w<<16|h, or final score)
+class Recorder:
+    """
+    Writes a session as one JSON header line (seed, tick length, size, speed, density) and
+    9-byte binary records: each key and resize is stamped with the simulation tick it feeds,
+    and an end record carries the final score so a replay can verify itself.
+    """
+    def __init__(self, path, sim, dt, density):
+        self.f = open(path, "wb")
+        header = {"format": REC_MAGIC, "version": REC_VERSION, "seed": sim.seed, "dt": dt,
+                  "size": [sim.w, sim.h], "speed": sim.speed, "density": density}
+        self.f.write(json.dumps(header).encode("utf-8") + b"\n")
+        self.size = (sim.w, sim.h)
+    def record(self, tick, sim, keys):
+        # call right before sim.tick() for simulation tick number `tick`
+        if (sim.w, sim.h) != self.size:
+            self.size = (sim.w, sim.h)
+            self.f.write(_REC.pack(tick, REC_RESIZE, (sim.w << 16) | sim.h))
+        for k in keys:
+            self.f.write(_REC.pack(tick, REC_KEY, k))
+    def close(self, tick, sim):
+        self.f.write(_REC.pack(tick, REC_END, sim.score))
+        self.f.close()
+class Replay:
+    """A recording loaded for playback: inputs(tick) returns (new size or None, keys)."""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            header = json.loads(f.readline().decode("utf-8"))
+            body = f.read()
+        if not isinstance(header, dict) or header.get("format") != REC_MAGIC or header.get("version") != REC_VERSION:
+            raise ValueError(f"{path}: not a Voyager recording (version {REC_VERSION})")
+        self.path = path
+        self.header = header
+        self.seed, self.dt = header["seed"], header["dt"]
+        self.size = tuple(header["size"])
+        self.speed, self.density = header["speed"], header["density"]
+        self.end_tick = None
+        self.end_score = None
+        self.inputs_at = {}
+        usable = len(body) - len(body) % _REC.size   # a torn last record is ignored
+        for tick, kind, value in _REC.iter_unpack(body[:usable]):
+            if kind == REC_END:
+                self.end_tick, self.end_score = tick, value
             else:
-                # periodic hints
-                if now - last_hint_time > 4.0 and random.random() < 0.06:
-                    copilot_msg = random.choice(COPILOT_PERSONA + AI_HINTS)
-                    copilot_timer = now; last_hint_time = now
-                safe_addstr(stdscr, panel_top + panel_h + 2, 4, copilot_msg[:ai_w-6], 4)
-            
-        # mini map
-        if show_map:
-            map_w = min(36, w//4)
-            map_h = min(8, h//4)
-            draw_box(stdscr, h - map_h - 4, 2, map_w, map_h, title="GALAXY MAP", col=2)
-            for i, name in enumerate(GALAXY_NAMES[:map_h-2]):
-                mark = "✅" if visited_report.get(name, {}).get("systems") else "  "
-                safe_addstr(stdscr, h - map_h - 3 + i, 4, f"{mark} {name}"[:map_w-4], 3)
-
-        # crew log popup
-        if show_log:
-            lg_w = min(64, w-8)
-            lg_h = 6
-            lg_left = max(4, (w - lg_w) // 2)
-            lg_top = max(3, (h - lg_h) // 2)
-            draw_box(stdscr, lg_top, lg_left, lg_w, lg_h, title="CREW LOG", col=2)
-            for i, line in enumerate(crew_logs):
-                safe_addstr(stdscr, lg_top+1+i, lg_left+2, line[:lg_w-4], 3)
-            show_log = False
-
-        # instructions
-        safe_addstr(stdscr, h-1, 2, "(Arrows/WASD move, X=scan, Z=warp, P=pickup, G=GALAXY MAP, I=AI Hints , Q=quit)", 2)
-        stdscr.refresh()
-        # frame cap
-        time.sleep(max(0, 1.0/FPS - (time.time() - now)))
-    # compile mission report
-    final_report = {
-        "missions_completed_count": len([m for m in missions_completed if m]),
-        "current_mission": mission["galaxy"],
-        "tasks_status": mission["tasks"],
-        "visited_report": visited_report,
-        "score": score,
-        "distance_traveled_AU": round(dist_traveled, 4),
-        "energy_consumed": round(energy_consumed, 2),
-        "fuel_remaining": round(fuel, 2),
-        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+                self.inputs_at.setdefault(tick, []).append((kind, value))
+        if self.end_tick is None:
+            # recording was cut short: play up to the last recorded input
+            self.end_tick = max(self.inputs_at, default=0) + 1
+    def inputs(self, tick):
+        size, keys = None, []
+        for kind, value in self.inputs_at.get(tick, ()):
+            if kind == REC_RESIZE:
+                size = (value >> 16, value & 0xFFFF)
+            else:
+                keys.append(value)
+        return size, keys
+    def new_voyage(self, engine="auto"):
+        w, h = self.size
+        return Voyage(w, h, self.speed, self.density, engine, seed=self.seed)
+# Session snapshots: versioned binary state, packed and written on a background thread
+SNAP_MAGIC = b"VOYSNAP"
+SNAP_VERSION = 2
+_SNAP_HEAD = struct.Struct("<7sH")
+# seed, w, h, t, speed, score, fuel, energy, dist, missions, galaxy, ship x/y, cam x/y,
+# ship art, flags, warp start, warp target, sprite odometer, last hint, copilot time, banner until
+_SNAP_CORE = struct.Struct("<qHHddqdddIIiiiiBBdidddd")
+_SNAP_FLAGS = ("show_ai", "show_map", "braille", "warp_active", "copilot_fresh", "autopilot")
+_SNAP_RNG = struct.Struct("<625I?d")    # random.Random.getstate(): MT words + index, gauss_next
+_SNAP_COUNT = struct.Struct("<I")
+_SNAP_LEN = struct.Struct("<H")     # string table entry length
+def _snap_col(code, values):
+    # one column: element count, then the little-endian array bytes
+    a = values if isinstance(values, array) else array(code, values)
+    if sys.byteorder == "big":
+        a = array(code, a); a.byteswap()
+    return _SNAP_COUNT.pack(len(a)) + a.tobytes()
+class _SnapReader:
+    __slots__ = ("data", "pos")
+    def __init__(self, data):
+        self.data, self.pos = data, 0
+    def unpack(self, st):
+        vals = st.unpack_from(self.data, self.pos)
+        self.pos += st.size
+        return vals
+    def col(self, code):
+        n, = self.unpack(_SNAP_COUNT)
+        a = array(code)
+        end = self.pos + n * a.itemsize
+        if end > len(self.data): raise ValueError("truncated")
+        a.frombytes(self.data[self.pos:end])
+        if sys.byteorder == "big": a.byteswap()
+        self.pos = end
+        return a
+def capture_snapshot(sim):
+    """
+    Copy what a snapshot needs from `sim`, cheaply enough for the simulation thread: the
+    visited lists and charted array are append-only / replaced, never edited, so only their
+    lengths (and the small recent-id buffer) are taken; pack_snapshot() does the rest.
+    """
+    st = sim.stars
+    if isinstance(st, StarField):
+        # star positions are cosmetic: single precision is plenty
+        stars = tuple(a.astype(np.float32) for a in (st.x, st.y, st.z))
+    else:
+        stars = tuple(zip(*[(s.x, s.y, s.z) for s in st.stars]))
+    return {
+        "core": (sim.seed, sim.w, sim.h, sim.t, sim.speed, sim.score, sim.fuel, sim.energy_consumed,
+                 sim.dist_traveled, sim.missions_completed, sim.galaxy_idx, sim.ship_x, sim.ship_y,
+                 sim.cam_x, sim.cam_y, SHIP_VARIANTS.index(sim.ship_art),
+                 sum(1 << i for i, f in enumerate(_SNAP_FLAGS) if getattr(sim, f)),
+                 sim.warp_start, -1 if sim.warp_target is None else sim.warp_target, sim.sprite_odo,
+                 sim.last_hint_time, sim.copilot_timer, sim.banner[1] if sim.banner else -1.0),
+        "rng": (sim.rng.getstate(), sim.fx_rng.getstate()),
+        "text": (sim.banner[0] if sim.banner else "", sim.copilot_msg),
+        "tasks": [(t["system"], t["task"], t["done"], t["reward"]) for t in sim.mission["tasks"]],
+        "visited": [(g, v["systems"], len(v["systems"])) for g, v in sim.visited_report.items()],
+        "timers": [(name, sim.timers.expires_at(name)) for name in sim.timers],
+        "packs": [(pp.x, pp.y, pp.t0, sim.power_packs.expires_at(pp)) for pp in sim.power_packs],
+        "charted": (sim.charted.sorted, list(sim.charted.recent)),
+        "stars": stars,
     }
-    save_report(final_report)
+def pack_snapshot(state):
+    strings = {}
+    def sid(text):
+        return strings.setdefault(text, len(strings))
+    out = [_SNAP_HEAD.pack(SNAP_MAGIC, SNAP_VERSION), _SNAP_CORE.pack(*state["core"])]
+    for version, words, gauss in state["rng"]:
+        out.append(_SNAP_RNG.pack(*words, gauss is not None, gauss or 0.0))
+    text_ids = [sid(t) for t in state["text"]]
+    tasks = state["tasks"]
+    task_cols = [_snap_col("H", [sid(t[0]) for t in tasks]), _snap_col("H", [sid(t[1]) for t in tasks]),
+                 _snap_col("B", [t[2] for t in tasks]), _snap_col("i", [t[3] for t in tasks])]
+    rows = [(GALAXY_NAMES.index(g), e) for g, systems, n in state["visited"] for e in systems[:n]]
+    visited_cols = [_snap_col("I", [g for g, _ in rows]), _snap_col("H", [sid(e["system"]) for _, e in rows]),
+                    _snap_col("H", [sid(e["task"]) for _, e in rows])]
+    timers = state["timers"]
+    timer_cols = [_snap_col("H", [sid(name) for name, _ in timers]), _snap_col("d", [k for _, k in timers])]
+    packs = state["packs"]
+    pack_cols = [_snap_col("i", [p[0] for p in packs]), _snap_col("i", [p[1] for p in packs]),
+                 _snap_col("d", [p[2] for p in packs]), _snap_col("d", [p[3] for p in packs])]
+    sorted_ids, recent = state["charted"]
+    charted = array("Q", sorted(itertools.chain(sorted_ids, recent)))
+    # string table first, so the reader can resolve the id columns that follow
+    table = [t.encode("utf-8") for t in strings]
+    out.append(_SNAP_COUNT.pack(len(table)))
+    out.extend(_SNAP_LEN.pack(len(b)) + b for b in table)
+    out.append(_snap_col("H", text_ids))
+    out += task_cols + visited_cols + timer_cols + pack_cols
+    out.append(_snap_col("Q", charted))
+    for c in state["stars"]:
+        out.append(_snap_col("f", array("f", c.tobytes()) if np is not None and isinstance(c, np.ndarray) else c))
+    return b"".join(out)
+def write_snapshot(path, data):
+    # atomic: readers (and --resume after a crash) see the old file or the new one, never half
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+def _snap_head(path, data):
+    if len(data) < _SNAP_HEAD.size or _SNAP_HEAD.unpack_from(data) != (SNAP_MAGIC, SNAP_VERSION):
+        raise ValueError(f"{path}: not a Voyager snapshot (version {SNAP_VERSION})")
+def read_snapshot(path):
+    """
+    Parse and check snapshot `path` without building anything (OSError, or ValueError if it
+    is not a snapshot we read or is damaged); restore_snapshot() turns it into a Voyage.
+    """
+    with open(path, "rb") as f:
+        r = _SnapReader(f.read())
+    _snap_head(path, r.data)
+    r.unpack(_SNAP_HEAD)
+    try:
+        core = r.unpack(_SNAP_CORE)
+        rngs = []
+        for _ in range(2):
+            *words, has_gauss, gauss = r.unpack(_SNAP_RNG)
+            rngs.append((3, tuple(words), gauss if has_gauss else None))
+        n, = r.unpack(_SNAP_COUNT)
+        table = []
+        for _ in range(n):
+            size, = r.unpack(_SNAP_LEN)
+            table.append(r.data[r.pos:r.pos+size].decode("utf-8"))
+            r.pos += size
+        text = [table[i] for i in r.col("H")]
+        systems, names, done, rewards = r.col("H"), r.col("H"), r.col("B"), r.col("i")
+        tasks = [{"system": table[a], "task": table[b], "done": bool(d), "reward": rw}
+                 for a, b, d, rw in zip(systems, names, done, rewards)]
+        visited = [(GALAXY_NAMES[g], table[a], table[b]) for g, a, b in zip(r.col("I"), r.col("H"), r.col("H"))]
+        timers = [(table[name], key) for name, key in zip(r.col("H"), r.col("d"))]
+        packs = list(zip(r.col("i"), r.col("i"), r.col("d"), r.col("d")))
+        charted = r.col("Q")
+        stars = [r.col("f") for _ in range(3)]
+        galaxy_idx, art, warp_target = core[10], core[15], core[18]
+        if (galaxy_idx >= len(GALAXY_NAMES) or art >= len(SHIP_VARIANTS) or warp_target >= len(GALAXY_NAMES)
+                or len(text) != 2 or len({len(c) for c in stars}) != 1):
+            raise ValueError("fields out of range")
+    except (struct.error, IndexError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"{path}: damaged snapshot ({e})") from None
+    return {"core": core, "rngs": rngs, "text": text, "tasks": tasks, "visited": visited, "timers": timers,
+            "packs": packs, "charted": charted, "stars": stars}
+def restore_snapshot(snap, engine="auto"):
+    """Rebuild the Voyage of a read_snapshot()."""
+    (seed, w, h, t, speed, score, fuel, energy, dist, missions, galaxy_idx, ship_x, ship_y, cam_x, cam_y,
+     art, flags, warp_start, warp_target, sprite_odo, last_hint, copilot_t, banner_until) = snap["core"]
+    rngs, stars, tasks = snap["rngs"], snap["stars"], snap["tasks"]
+    banner_text, copilot_msg = snap["text"]
+    sim = Voyage(w, h, speed, len(stars[2]), engine, seed=seed)
+    sim.rng.setstate(rngs[0]); sim.fx_rng.setstate(rngs[1])
+    sim.t, sim.score, sim.fuel, sim.energy_consumed, sim.dist_traveled = t, score, fuel, energy, dist
+    sim.missions_completed = missions
+    sim.galaxy_idx = galaxy_idx
+    sim.galaxy = GALAXY_NAMES[galaxy_idx]
+    systems = [place_system(x, w, h) for x in sim.universe.galaxy(sim.galaxy).systems]
+    sim.mission = {"galaxy": sim.galaxy, "systems": systems, "tasks": tasks, "assigned_by": "Earth Command"}
+    sim.index_mission()
+    sim.prefetch_next()
+    sim.sector = SectorMap(galaxy_idx, sim.universe.galaxy_seed(sim.galaxy))
+    for name, system, task in snap["visited"]:
+        sim.visited_report.setdefault(name, {"type": GALAXY_DB[name]["type"], "systems": []})["systems"].append(
+            {"system": system, "task": task})
+    sim.ship_x, sim.ship_y, sim.cam_x, sim.cam_y = ship_x, ship_y, cam_x, cam_y
+    sim.ship_art = SHIP_VARIANTS[art]
+    for i, f in enumerate(_SNAP_FLAGS):
+        setattr(sim, f, bool(flags >> i & 1))
+    sim.autopilot = Autopilot() if sim.autopilot else None   # engaged again; it replans on its first key
+    sim.warp_start = warp_start
+    sim.warp_target = None if warp_target < 0 else warp_target
+    sim.sprite_odo = sim.prev_sprite_odo = sprite_odo
+    sim.last_hint_time, sim.copilot_timer, sim.copilot_msg = last_hint, copilot_t, copilot_msg
+    sim.banner = (banner_text, banner_until) if banner_until >= 0 else None
+    sim.timers.clear()
+    for name, key in snap["timers"]:
+        sim.timers.push(name, key)
+    for x, y, t0, expiry in snap["packs"]:
+        pp = PowerPack(x, y, t0)
+        sim.power_packs.push(pp, expiry)
+        sim.pack_index.insert(pp, x, y)
+    sim.charted.sorted = snap["charted"]
+    st = sim.stars
+    if isinstance(st, StarField):
+        for name, col in zip("xyz", stars):
+            getattr(st, name)[:] = np.frombuffer(col, dtype=np.float32)
+        st.px[:], st.pz[:] = st.x, st.z
+        st.update()
+    else:
+        for s, x, y, z in zip(st.stars, *stars):
+            s.x, s.y, s.z = x, y, z
+            s.update()
+    # the event log restarts from here: a session record carrying what was already achieved
+    sim.events = []
+    sim.emit("session", galaxy=sim.galaxy, tasks=[dict(t) for t in tasks], resumed=True,
+             missions_completed=missions, systems_charted=len(sim.charted),
+             visited_report={g: {"type": v["type"], "systems": list(v["systems"])} for g, v in sim.visited_report.items()})
+    return sim
+def load_snapshot(path, engine="auto"):
+    """Rebuild the Voyage saved in snapshot `path` (ValueError if it is not a snapshot we read)."""
+    return restore_snapshot(read_snapshot(path), engine)
+class SnapshotWriter:
+    """
+    Autosave worker: save() hands a capture_snapshot() to a background thread that packs
+    and atomically writes it; if saves queue up only the newest is written.
+    """
+    _STOP = object()
+    def __init__(self, path):
+        self.path = path
+        self.error = None
+        self.saves = 0
+        self.q = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._writer, name="voyager-snapshot", daemon=True)
+        self.thread.start()
+    def save(self, sim):
+        self.q.put(capture_snapshot(sim))
+    def _writer(self):
+        stop = False
+        while not stop:
+            state = self.q.get()
+            if state is self._STOP: break
+            while not self.q.empty():
+                nxt = self.q.get()
+                if nxt is self._STOP:
+                    stop = True
+                    break
+                state = nxt
+            self._write(state)
+    def _write(self, state):
+        try:
+            write_snapshot(self.path, pack_snapshot(state))
+            self.saves += 1
+        except (OSError, ValueError, struct.error) as e:
+            self.error = e   # shown on the goodbye screen; the game carries on without the save
+    def close(self):
+        self.q.put(self._STOP)
+        self.thread.join(timeout=10.0)
+def run(backend, *args, **kwargs):
+    """Play a session on `backend` (see run_async); blocks until the goodbye screen is dismissed."""
+    asyncio.run(run_async(backend, *args, **kwargs))
+async def run_async(backend, init_speed, density, engine="auto", profile_path=None, tick_hz=SIM_HZ, render_hz=FPS,
+                    event_log=None, seed=None, record=None, replay=None, adaptive=True, braille=False,
+                    resume=None, snapshot=None, autosave=SNAP_EVERY, broadcast=None, intro=True, trace=NULL_TRACE):
+    """
+    The interactive runtime: an input pump drains keys as they arrive, the simulation task
+    applies all of them on every fixed tick, and the render task draws at `render_hz` or
+    straight after a tick that consumed input. Every screen is composed in one FrameBuffer
+    and handed to the backend (curses, ANSI, ...). `replay` is a Replay to play back and
+    `resume` a read_snapshot() to continue; with a `snapshot` path the session is saved there
+    every `autosave` seconds and on exit. `broadcast` is a Unix socket path that spectators
+    (--spectate) can watch the game on. The first frame goes up before the voyage exists:
+    stars and mission are built (or the snapshot restored) on a worker thread behind the
+    splash. `intro=False` skips the splash and the entering pause.
+    """
+    trace.mark("terminal")
+    random.seed()
+    h,w = backend.size()
+    if replay:
+        # a replay owns the seed, tick length and simulated size; the terminal only views it
+        rp = replay
+        tick_hz = 1.0 / rp.dt
+        build = lambda: rp.new_voyage(engine)
+    elif resume:
+        rp, build = None, lambda: restore_snapshot(resume, engine)
+    else:
+        rp = None
+        build = lambda: Voyage(w, h, init_speed, density, engine, seed=seed)
+    building = asyncio.get_running_loop().run_in_executor(None, build)
+    if broadcast:
+        backend = SpectatorBroadcast(backend, broadcast)
+        await backend.start()
+    pump = InputPump(backend)
+    pump.start()
+    buf = FrameBuffer(h, w)
+    if intro:
+        splash_screen(buf, None)
+        backend.present(buf)
+        trace.mark("first frame")
+    sim = await building
+    trace.mark("voyage")
+    if braille or not resume: sim.braille = braille
+    snap = SnapshotWriter(snapshot) if snapshot and not rp else None
+    next_save = sim.t + autosave
+    log = open_event_log(event_log)
+    rec = Recorder(record, sim, 1.0 / tick_hz, density) if record and not rp else None
+    n = 0   # simulation ticks so far; recordings and replays are stamped with it
+    pilot_every = max(1, int(round(tick_hz / PILOT_HZ)))
+
+    # Show splash 
+    if intro:
+        buf.erase()
+        splash_screen(buf, sim.mission)
+        backend.present(buf)
+        trace.mark("mission brief")
+        await pump.get()
+        trace.mark("splash", wait=True)
+        buf.erase()
+        safe_addstr(buf, h//2, max(0,(w - 40)//2), f"Entering {sim.galaxy}... {random.choice(['Be vigilant.','Good luck, Captain.'])}", 3)
+        backend.present(buf)
+        await pump.get(ENTER_DELAY)
+        trace.mark("entering", wait=True)
+
+    layers = LayerCache()
+    # profiling stays wired in; the F key (or --profile) swaps in the real profiler
+    prof = FrameProfiler() if profile_path else NULL_PROFILER
+    show_perf = False
+    # simulation ticks at a fixed rate; renders are interpolated and dropped first under load
+    sched = FixedStepScheduler(tick_hz, render_hz)
+    clock = time.perf_counter
+    # adaptive level of detail trades cosmetic detail for holding the render rate
+    quality = QualityController(1.0 / render_hz, clock()) if adaptive else None
+    paused = False        # terminal too small: no ticks, the render task shows a notice
+    wake = asyncio.Event()    # set by the simulation after a tick that consumed input
+    prof.begin()
+
+    async def simulate():
+        nonlocal n, prof, show_perf, paused, next_save
+        while sim.running:
+            h,w = backend.size()
+            if h < 20 or w < 70:
+                paused = True
+                wake.set()
+                if await pump.get(0.3) in KEYS_QUIT:
+                    sim.running = False
+                continue
+            if paused:
+                paused = False
+                sched.reset(clock())
+                if quality: quality.reset(clock())
+                prof.begin()
+            t0 = clock()
+            if not rp: sim.resize(w, h)
+            sim.prof = prof
+            fresh = False
+            for _ in range(sched.advance(t0)):
+                keys = []
+                for k in pump.take():
+                    if k in (ord('f'), ord('F')):
+                        show_perf = not show_perf
+                        if show_perf and not prof.enabled:
+                            prof = sim.prof = FrameProfiler()
+                            prof.begin()
+                    else:
+                        keys.append(k)
+                fresh = fresh or bool(keys)
+                if not rp and not keys and sim.autopilot and n % pilot_every == 0:
+                    k = sim.autopilot(sim)
+                    if k is not None: keys.append(k)
+                if rp:
+                    if n >= rp.end_tick or any(k in KEYS_QUIT for k in keys):
+                        sim.running = False
+                        break
+                    size, keys = rp.inputs(n)
+                    if size: sim.resize(*size)
+                elif rec:
+                    rec.record(n, sim, keys)
+                sim.tick(sched.step, keys)
+                n += 1
+                forward_events(sim, log)
+                if not sim.running: break
+            if snap and autosave > 0 and sim.t >= next_save:
+                snap.save(sim)   # a cheap capture here; packing and writing happen off-thread
+                next_save = sim.t + autosave
+            if quality: quality.add_busy(clock() - t0)
+            if fresh or not sim.running: wake.set()
+            await asyncio.sleep(sched.tick_wait(clock()))
+            prof.lap("idle")
+
+    async def render():
+        nonlocal trace
+        while sim.running:
+            h,w = backend.size()
+            if (h, w) != buf.getmaxyx():
+                buf.resize(h, w)
+                backend.clear()
+            now = clock()
+            if paused:
+                buf.erase()
+                safe_addstr(buf, 1, 2, "Terminal too small — resize to at least 70x20", 5)
+                safe_addstr(buf, 3, 2, "Press Q to quit.", 3)
+                backend.present(buf)
+            elif sched.render_due(now, wake.is_set()):
+                buf.erase()
+                draw_frame(buf, sim, prof, show_perf, sched.alpha(now), layers)
+                backend.present(buf)
+                if trace.enabled:
+                    trace.mark("first game frame")
+                    trace = NULL_TRACE
+                prof.lap("present")
+                prof.end()
+                prof.begin()
+                if quality:
+                    quality.add_busy(clock() - now)
+                    if quality.frame_done(clock()):
+                        sim.set_lod(quality.level)
+            wake.clear()
+            # sleep until the next render is due or fresh input has been simulated
+            try:
+                await asyncio.wait_for(wake.wait(), 0.3 if paused else sched.render_wait(clock()))
+            except asyncio.TimeoutError:
+                pass
+            prof.lap("idle")
+
+    await asyncio.gather(simulate(), render())
+    # compile mission report
+    final_report = sim.report()
+    if not rp: save_report(final_report)
+    if snap:
+        snap.save(sim)
+        snap.close()
+    if rec: rec.close(n, sim)
+    close_event_log(sim, log)
+    if profile_path and prof.enabled:
+        try:
+            prof.dump(profile_path)
+        except OSError:
+            pass
     # goodbye screen
-    stdscr.erase()
+    h,w = backend.size()
+    buf.resize(h, w)
+    backend.clear()
     title = "🖖 MISSION REPORT - EARTH COMMAND 🖖"
-    safe_addstr(stdscr, 1, max(0,(w - len(title))//2), title, 2)
-    safe_addstr(stdscr, 3, 4, f"Galaxy: {final_report['current_mission']}", 3)
-    safe_addstr(stdscr, 4, 4, f"Score: {final_report['score']}", 3)
-    safe_addstr(stdscr, 5, 4, f"Distance (AU): {final_report['distance_traveled_AU']}", 1)
-    safe_addstr(stdscr, 6, 4, f"Energy consumed: {final_report['energy_consumed']}", 1)
-    safe_addstr(stdscr, 7, 4, f"Saved mission_report.json / .txt", 2)
-    safe_addstr(stdscr, h-2, max(0,(w - 28)//2), "Press any key to exit.", 4)
-    stdscr.nodelay(False)
+    safe_addstr(buf, 1, max(0,(w - len(title))//2), title, 2)
+    safe_addstr(buf, 3, 4, f"Galaxy: {final_report['current_mission']}", 3)
+    safe_addstr(buf, 4, 4, f"Score: {final_report['score']}", 3)
+    safe_addstr(buf, 5, 4, f"Distance (AU): {final_report['distance_traveled_AU']}", 1)
+    safe_addstr(buf, 6, 4, f"Energy consumed: {final_report['energy_consumed']}", 1)
+    safe_addstr(buf, 7, 4, f"Saved mission_report.json / .txt", 2)
+    if snap and snap.error:
+        safe_addstr(buf, 8, 4, f"Snapshot not saved: {snap.error}", 5)
+    safe_addstr(buf, h-2, max(0,(w - 28)//2), "Press any key to exit.", 4)
+    backend.present(buf)
+    await pump.get()
+    pump.stop()
+    if broadcast: await backend.close()
+
+# Headless runner (no terminal): scripted keys, fixed dt
+def parse_size(text):
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h)
+def run_headless(frames, dt, size, keys="", init_speed=DEFAULT_SPEED, density=STAR_DENSITY, engine="auto",
+                 event_log=None, seed=None, record=None, pilot=None, render=False):
+    """
+    Advance a Voyage `frames` times without curses. `keys` is consumed one character per
+    frame ('.' = no key, which hands the frame to `pilot` if one is named); returns a
+    summary dict with the final report and throughput. With `render` every frame is also
+    composed and diffed into a NullBackend, so drawing code is exercised too.
+    """
+    w, h = size
+    sim = Voyage(w, h, init_speed, density, engine, seed=seed)
+    log = open_event_log(event_log)
+    rec = Recorder(record, sim, dt, density) if record else None
+    script = [ord(c) for c in keys]
+    driver = PILOTS[pilot]() if pilot else None
+    every = max(1, int(round(1.0 / (PILOT_HZ * dt))))
+    out = NullBackend(h, w) if render else None
+    buf = FrameBuffer(h, w)
+    t0 = time.perf_counter()
+    n = 0
+    while n < frames and sim.running:
+        k = script[n] if n < len(script) else ord('.')
+        pilot_now = driver or sim.autopilot   # an 'o' in the script engages the in-game autopilot
+        if k == ord('.') and pilot_now and n % every == 0:
+            k = pilot_now(sim) or ord('.')
+        tick_keys = (k,) if k != ord('.') else ()
+        if rec: rec.record(n, sim, tick_keys)
+        sim.tick(dt, tick_keys)
+        forward_events(sim, log)
+        if out:
+            buf.erase()
+            draw_frame(buf, sim)
+            out.present(buf)
+        n += 1
+    wall = time.perf_counter() - t0
+    if rec: rec.close(n, sim)
+    close_event_log(sim, log)
+    return {"frames": n, "dt": dt, "seed": sim.seed, "sim_seconds": round(sim.t, 4), "wall_seconds": round(wall, 4),
+            "frames_per_second": round(n / wall, 1) if wall > 0 else None, "report": sim.report()}
+def replay_headless(rp, engine="auto", event_log=None):
+    """Re-drive a Replay as fast as possible with rendering disabled."""
+    sim = rp.new_voyage(engine)
+    log = open_event_log(event_log)
+    t0 = time.perf_counter()
+    n = 0
+    while n < rp.end_tick and sim.running:
+        size, keys = rp.inputs(n)
+        if size: sim.resize(*size)
+        sim.tick(rp.dt, keys)
+        forward_events(sim, log)
+        n += 1
+    wall = time.perf_counter() - t0
+    close_event_log(sim, log)
+    return {"replay": rp.path, "frames": n, "seed": rp.seed, "sim_seconds": round(sim.t, 4),
+            "wall_seconds": round(wall, 4), "speedup": round(sim.t / wall, 1) if wall > 0 else None,
+            "verified": None if rp.end_score is None else rp.end_score == sim.score,
+            "report": sim.report()}
+
+# Pilots: built-in drivers that return the next key for a Voyage (headless, batch, autopilot)
+PILOT_HZ = 14.0     # pilot key presses per second, about keyboard auto-repeat
+PACK_DETOUR_MAX = 24        # longest detour, in cells, the autopilot takes for a power pack
+ROUTE_EXACT_MAX = 6         # tours up to this many stops are searched exhaustively
+def shadowed(sim, name):
+    """True when another system shares this one's cell and wins every scan there: its task cannot be done."""
+    s = sim.systems_by_name[name]
+    hits = sim.system_index.query_radius(s.x, s.y, 0)
+    return bool(hits) and hits[0][1] != name
+def greedy_pilot(sim):
+    """Key for the next action: collect packs in reach, fly to the nearest open task and scan it, then warp."""
+    if sim.warp_active: return None
+    if sim.pack_index.query_box(sim.ship_x, sim.ship_y, POWER_COLLECT_RADIUS): return ord('p')
+    hit = sim.system_index.nearest(sim.ship_x, sim.ship_y, lambda n: n in sim.open_tasks and not shadowed(sim, n))
+    if hit is None: return ord('z')
+    dist, sys = hit[0], sim.systems_by_name[hit[1]]
+    if dist <= SCAN_RADIUS:
+        # a scan hits the nearest system, so only scan once the target is that one
+        hits = sim.system_index.query_radius(sim.ship_x, sim.ship_y, SCAN_RADIUS)
+        if hits and hits[0][1] == sys.name: return ord('x')
+    dx, dy = sys.x - sim.ship_x, sys.y - sim.ship_y
+    if abs(dx) >= abs(dy):
+        return ord('d') if dx > 0 else ord('a')
+    return ord('s') if dy > 0 else ord('w')
+def route_cost(a, b):
+    # the ship moves one cell per key press along x or y, so steps are Manhattan distance
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+def plan_route(start, stops):
+    """
+    Visiting order (indexes into `stops`, a list of (x, y)) for an open path from `start`:
+    nearest neighbour, then 2-opt segment reversals and single-stop moves (or-opt) until
+    neither shortens the path. Up to ROUTE_EXACT_MAX stops are simply solved exactly.
+    """
+    if len(stops) <= ROUTE_EXACT_MAX:
+        def length(order):
+            return sum(route_cost(a, b) for a, b in zip([start] + [stops[i] for i in order], [stops[i] for i in order]))
+        return list(min(itertools.permutations(range(len(stops))), key=length))
+    left = set(range(len(stops)))
+    order, cur = [], start
+    while left:
+        j = min(left, key=lambda i: (route_cost(cur, stops[i]), i))
+        order.append(j)
+        left.remove(j)
+        cur = stops[j]
+    pts = [start] + [stops[i] for i in order]
+    n = len(pts)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                # reverse pts[i..j]; an open path has no edge after its last point
+                before = route_cost(pts[i-1], pts[i])
+                after = route_cost(pts[i-1], pts[j])
+                if j + 1 < n:
+                    before += route_cost(pts[j], pts[j+1])
+                    after += route_cost(pts[i], pts[j+1])
+                if after < before:
+                    pts[i:j+1] = pts[i:j+1][::-1]
+                    order[i-1:j] = order[i-1:j][::-1]
+                    improved = True
+        for i in range(1, n):
+            # cost saved by taking pts[i] out, then the cheapest place to put it back
+            nxt = pts[i+1] if i + 1 < n else None
+            saved = route_cost(pts[i-1], pts[i])
+            if nxt: saved += route_cost(pts[i], nxt) - route_cost(pts[i-1], nxt)
+            rest = pts[:i] + pts[i+1:]
+            best, at = saved, None
+            for k in range(len(rest)):
+                add = route_cost(rest[k], pts[i])
+                if k + 1 < len(rest):
+                    add += route_cost(pts[i], rest[k+1]) - route_cost(rest[k], rest[k+1])
+                if add < best: best, at = add, k + 1
+            if at is not None:
+                p, o = pts[i], order[i-1]
+                pts = rest[:at] + [p] + rest[at:]
+                rest_o = order[:i-1] + order[i:]
+                order = rest_o[:at-1] + [o] + rest_o[at-1:]
+                improved = True
+                break
+    return order
+class Autopilot:
+    """
+    Flies the mission: plans a tour over the systems with open tasks (plan_route, threat
+    systems last) and steers along it one key per call. The plan is cached and repaired,
+    not rebuilt: finished stops and vanished packs are dropped, and a power pack is spliced
+    in at its cheapest position when the detour is short (or fuel is low) and the ship can
+    get there before it expires. Only a new mission replans from scratch.
+    """
+    def __init__(self):
+        self.route = []            # upcoming stops: system names and PowerPack objects
+        self.mission = None        # mission the route was planned for
+        self.planned = frozenset() # open task systems at planning time
+        self.replans = 0
+    def __call__(self, sim):
+        return self.next_key(sim)
+    @staticmethod
+    def point(sim, stop):
+        if isinstance(stop, PowerPack): return stop.x, stop.y
+        s = sim.systems_by_name[stop]
+        return s.x, s.y
+    def update(self, sim):
+        # a shadowed system's task can never be scanned: it counts as done for the route and the warp
+        open_now = frozenset(n for n in sim.open_tasks if not shadowed(sim, n))
+        if sim.mission is not self.mission or not open_now <= self.planned:
+            self.replan(sim, open_now)
+        else:
+            self.route = [s for s in self.route
+                          if (s in sim.power_packs if isinstance(s, PowerPack) else s in open_now)]
+            self.planned = open_now
+        self.splice_packs(sim)
+    def replan(self, sim, open_now):
+        names = sorted(open_now)
+        safe = [n for n in names if not sim.systems_by_name[n].threat]
+        risky = [n for n in names if sim.systems_by_name[n].threat]
+        start = (sim.ship_x, sim.ship_y)
+        route = [safe[i] for i in plan_route(start, [self.point(sim, n) for n in safe])]
+        last = self.point(sim, route[-1]) if route else start
+        route += [risky[i] for i in plan_route(last, [self.point(sim, n) for n in risky])]
+        self.route, self.mission, self.planned = route, sim.mission, open_now
+        self.replans += 1
+    def splice_packs(self, sim):
+        low = sim.fuel < FUEL_CONSUMPTION_SCAN * 3
+        for pp in sim.power_packs:
+            if pp in self.route: continue
+            p = (pp.x, pp.y)
+            pts = [(sim.ship_x, sim.ship_y)] + [self.point(sim, s) for s in self.route]
+            best = None
+            for i, a in enumerate(pts):
+                extra = route_cost(a, p)
+                if i + 1 < len(pts):
+                    extra += route_cost(p, pts[i+1]) - route_cost(a, pts[i+1])
+                if best is None or extra < best[0]: best = (extra, i)
+            extra, i = best
+            steps = sum(route_cost(pts[k], pts[k+1]) for k in range(i)) + route_cost(pts[i], p)
+            if (low or extra <= PACK_DETOUR_MAX) and sim.t + steps / PILOT_HZ < sim.power_packs.expires_at(pp):
+                self.route.insert(i, pp)
+    def target(self, sim):
+        """(distance, label) of the next stop, for the HUD."""
+        # after a warp the route names the old mission's systems until next_key() replans
+        if not self.route or sim.mission is not self.mission: return None
+        stop = self.route[0]
+        x, y = self.point(sim, stop)
+        return math.hypot(x - sim.ship_x, y - sim.ship_y), ("power pack" if isinstance(stop, PowerPack) else stop)
+    def next_key(self, sim):
+        if sim.warp_active: return None
+        if sim.pack_index.query_box(sim.ship_x, sim.ship_y, POWER_COLLECT_RADIUS): return ord('p')
+        self.update(sim)
+        if not self.route:
+            # mission done (or nothing reachable): jump on once the warp is affordable
+            return ord('z') if not self.planned and sim.fuel >= warp_fuel_cost() else None
+        stop = self.route[0]
+        x, y = self.point(sim, stop)
+        if not isinstance(stop, PowerPack) and math.hypot(x - sim.ship_x, y - sim.ship_y) <= SCAN_RADIUS:
+            hits = sim.system_index.query_radius(sim.ship_x, sim.ship_y, SCAN_RADIUS)
+            if hits and hits[0][1] == stop:
+                return ord('x') if sim.fuel >= FUEL_CONSUMPTION_SCAN else None
+        dx, dy = x - sim.ship_x, y - sim.ship_y
+        if abs(dx) >= abs(dy):
+            return ord('d') if dx > 0 else ord('a')
+        return ord('s') if dy > 0 else ord('w')
+PILOTS = {"greedy": lambda: greedy_pilot, "auto": Autopilot}
+
+# Batch Monte Carlo (balancing): many piloted voyages across processes, no rendering
+BATCH_TUNABLES = ("TASK_REWARD_BASE", "FUEL_CONSUMPTION_MOVE", "FUEL_CONSUMPTION_SCAN",
+                  "FUEL_CONSUMPTION_PICK", "WARP_FUEL_MULT", "POWER_SPAWN_CHANCE", "POWER_LIFE",
+                  "POWER_COLLECT_RADIUS", "SCAN_RADIUS", "FUEL_MAX")
+def parse_override(text):
+    name, sep, value = text.partition("=")
+    name = name.strip().upper()
+    if not sep or name not in BATCH_TUNABLES:
+        raise ValueError(f"expected NAME=VALUE with NAME one of {', '.join(BATCH_TUNABLES)}")
+    number = float(value)
+    if isinstance(globals()[name], int):
+        if not number.is_integer():
+            raise ValueError(f"{name} takes a whole number, not {value.strip()}")
+        return name, int(number)
+    return name, number
+def apply_overrides(overrides):
+    # the game rules read these module constants at call time, so rebinding them is enough
+    globals().update(overrides)
+def batch_voyage(seed, seconds=600.0, dt=1.0/SIM_HZ, size=(120, 40), pilot="auto"):
+    """One piloted voyage until fuel runs out (no longer covers a scan) or `seconds` of sim time."""
+    w, h = size
+    sim = Voyage(w, h, DEFAULT_SPEED, 0, "python", seed=seed)   # minimum starfield: nothing is drawn
+    pilot = PILOTS[pilot]()
+    every = max(1, int(round(1.0 / (PILOT_HZ * dt))))
+    tasks = 0
+    exhausted = None
+    n = 0
+    while sim.t < seconds and sim.running:
+        key = pilot(sim) if n % every == 0 else None
+        sim.tick(dt, (key,) if key is not None else ())
+        n += 1
+        for kind, _ in sim.pop_events():
+            if kind == "task": tasks += 1
+        if sim.fuel < FUEL_CONSUMPTION_SCAN:
+            exhausted = sim.t
+            break
+    return {"seed": seed, "score": sim.score, "tasks": tasks, "missions": sim.missions_completed,
+            "distance": sim.dist_traveled, "fuel_left": sim.fuel, "exhausted_at": exhausted,
+            "charted": len(sim.charted)}
+def _batch_task(args):
+    return batch_voyage(*args)
+def summarize(values):
+    if not values: return None
+    v = sorted(values)
+    return {"mean": round(statistics.fmean(v), 4), "stdev": round(statistics.pstdev(v), 4),
+            "min": round(v[0], 4), "p5": round(percentile(v, 5), 4), "p50": round(percentile(v, 50), 4),
+            "p95": round(percentile(v, 95), 4), "max": round(v[-1], 4)}
+def run_batch(voyages, base_seed=0, workers=None, seconds=600.0, dt=1.0/SIM_HZ, size=(120, 40),
+              overrides=None, pilot="auto", log=None):
+    """
+    Run `voyages` independent voyages (seeds base_seed..base_seed+voyages-1) across a process
+    pool and aggregate their outcomes. Voyages share nothing, so throughput scales with cores.
+    """
+    overrides = dict(overrides or {})
+    workers = workers or os.cpu_count() or 1
+    jobs = ((base_seed + i, seconds, dt, size, pilot) for i in range(voyages))
+    # large chunks keep IPC negligible; several per worker keeps the tail short
+    chunk = max(1, min(256, voyages // (workers * 8)))
+    t0 = time.perf_counter()
+    outcomes = []
+    if workers == 1:
+        apply_overrides(overrides)
+        results = map(_batch_task, jobs)
+        pool = None
+    else:
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=apply_overrides, initargs=(overrides,))
+        results = pool.map(_batch_task, jobs, chunksize=chunk)
     try:
-        stdscr.getch()
-    except Exception:
-        pass
+        for r in results:
+            outcomes.append(r)
+            if log and len(outcomes) % max(1, voyages // 20) == 0:
+                log.write(f"  {len(outcomes)}/{voyages} voyages\n")
+                log.flush()
+    finally:
+        if pool: pool.shutdown()
+    wall = time.perf_counter() - t0
+    exhausted = [o["exhausted_at"] for o in outcomes if o["exhausted_at"] is not None]
+    return {
+        "batch": "voyager-monte-carlo", "version": 1,
+        "voyages": len(outcomes), "base_seed": base_seed, "workers": workers,
+        "sim_seconds": seconds, "dt": dt, "size": f"{size[0]}x{size[1]}", "pilot": pilot, "overrides": overrides,
+        "wall_seconds": round(wall, 2), "voyages_per_second": round(len(outcomes) / wall, 2) if wall > 0 else None,
+        "score": summarize([o["score"] for o in outcomes]),
+        "tasks_completed": summarize([o["tasks"] for o in outcomes]),
+        "missions_completed": summarize([o["missions"] for o in outcomes]),
+        "distance_AU": summarize([o["distance"] for o in outcomes]),
+        "fuel_left": summarize([o["fuel_left"] for o in outcomes]),
+        "fuel_exhausted_fraction": round(len(exhausted) / len(outcomes), 4) if outcomes else None,
+        "fuel_exhausted_at": summarize(exhausted),
+    }
+
+# Report aggregation: fleet-wide statistics over many mission_report.json/.txt files
+REPORT_CACHE_VERSION = 1
+def report_paths(paths, exclude=()):
+    """
+    Yield report files under `paths` (files or directories, walked lazily). A .txt report
+    next to a .json one with the same stem is the same session and is skipped.
+    """
+    for p in paths:
+        if not os.path.isdir(p):
+            yield p
+            continue
+        for root, dirs, files in os.walk(p):
+            dirs.sort()
+            names = set(files)
+            for name in sorted(files):
+                stem, ext = os.path.splitext(name)
+                if ext not in (".json", ".txt") or (ext == ".txt" and stem + ".json" in names): continue
+                full = os.path.join(root, name)
+                if os.path.abspath(full) not in exclude: yield full
+def summarize_report(path):
+    """One report reduced to the numbers aggregate_reports() folds; None if it is not a report."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if not text.lstrip().startswith("{"):
+        text = text.partition("\n")[2]   # .txt variant: "MISSION REPORT" header line, then the JSON
+    try:
+        r = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(r, dict) or "score" not in r or "tasks_status" not in r:
+        return None
+    by_galaxy, by_task = {}, {}
+    def count(table, key, field):
+        row = table.setdefault(key, [0, 0, 0])   # completed (all missions), assigned, done (last mission)
+        row[field] += 1
+    for g, visit in (r.get("visited_report") or {}).items():
+        for e in visit.get("systems", ()):
+            count(by_galaxy, g, 0)
+            count(by_task, e.get("task"), 0)
+    galaxy = r.get("current_mission")
+    for t in r["tasks_status"]:
+        for field in ((1, 2) if t.get("done") else (1,)):
+            count(by_galaxy, galaxy, field)
+            count(by_task, t.get("task"), field)
+    return {"score": r.get("score", 0), "energy": r.get("energy_consumed", 0.0),
+            "distance": r.get("distance_traveled_AU", 0.0), "fuel": r.get("fuel_remaining", 0.0),
+            "missions": r.get("missions_completed_count", 0), "charted": r.get("systems_charted", 0),
+            "by_galaxy": by_galaxy, "by_task": by_task}
+def _summary_task(path):
+    try:
+        return path, summarize_report(path), None
+    except (OSError, UnicodeDecodeError) as e:
+        return path, None, str(e)
+def aggregate_reports(paths, workers=None, cache_path=None, log=None, window=4096):
+    """
+    Stream report files through a process pool and fold them into score / energy / distance
+    statistics and task completion per galaxy and per task type. Per-file summaries are kept
+    in `cache_path` keyed on size and mtime, so a rerun only parses new or changed reports.
+    """
+    t0 = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    cache = {}
+    if cache_path:
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == REPORT_CACHE_VERSION: cache = data["files"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass   # missing or unreadable cache: parse everything
+    scalars = {k: array("d") for k in ("score", "energy", "distance", "fuel", "missions", "charted")}
+    tables = {"by_galaxy": {}, "by_task": {}}
+    counts = {"files": 0, "parsed": 0, "cached": 0, "skipped": 0}
+    errors = []
+    def fold(summary):
+        for k, col in scalars.items(): col.append(summary[k])
+        for name, table in tables.items():
+            for key, row in summary[name].items():
+                acc = table.setdefault(str(key), [0, 0, 0])
+                for i, v in enumerate(row): acc[i] += v
+    pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        stream = report_paths(paths, exclude={os.path.abspath(cache_path)} if cache_path else ())
+        while True:
+            # a window at a time: the file list is never materialized
+            batch = list(itertools.islice(stream, window))
+            if not batch: break
+            todo = []
+            for path in batch:
+                counts["files"] += 1
+                try:
+                    st = os.stat(path)
+                except OSError as e:
+                    errors.append(f"{path}: {e}")
+                    continue
+                key, stamp = os.path.abspath(path), [st.st_size, st.st_mtime_ns]
+                hit = cache.get(key)
+                if hit and hit[:2] == stamp:
+                    counts["cached"] += 1
+                    if hit[2] is None: counts["skipped"] += 1
+                    else: fold(hit[2])
+                else:
+                    todo.append((key, stamp))
+            if not todo: continue
+            keys = [k for k, _ in todo]
+            results = pool.map(_summary_task, keys, chunksize=max(1, len(keys) // (workers * 4))) if pool \
+                else map(_summary_task, keys)
+            for (key, stamp), (_, summary, err) in zip(todo, results):
+                if err:
+                    errors.append(f"{key}: {err}")
+                    continue
+                counts["parsed"] += 1
+                cache[key] = stamp + [summary]
+                if summary is None: counts["skipped"] += 1
+                else: fold(summary)
+            if log:
+                log.write(f"  {counts['files']} files ({counts['parsed']} parsed, {counts['cached']} cached)\n")
+                log.flush()
+    finally:
+        if pool: pool.shutdown()
+    if cache_path and counts["parsed"]:
+        tmp = cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": REPORT_CACHE_VERSION, "files": cache}, f, separators=(",", ":"))
+        os.replace(tmp, cache_path)
+    def rates(table):
+        return {k: {"completed": c, "assigned": a, "done": d, "completion_rate": round(d / a, 4) if a else None}
+                for k, (c, a, d) in sorted(table.items())}
+    return {
+        "aggregate": "voyager-reports", "version": 1, **counts,
+        "reports": len(scalars["score"]), "errors": errors[:20], "error_count": len(errors),
+        "wall_seconds": round(time.perf_counter() - t0, 2),
+        "score": summarize(scalars["score"]), "energy_consumed": summarize(scalars["energy"]),
+        "distance_AU": summarize(scalars["distance"]), "fuel_remaining": summarize(scalars["fuel"]),
+        "missions_completed": summarize(scalars["missions"]), "systems_charted": summarize(scalars["charted"]),
+        # completed: tasks in visited_report (every mission); assigned/done: the last mission's tasks
+        "by_galaxy": rates(tables["by_galaxy"]), "by_task": rates(tables["by_task"]),
+    }
+
+# Benchmarks (null or ANSI-to-devnull backend, so no TTY is needed)
+BENCH_OVERLAYS = {"none": (), "ai": ("show_ai",), "map": ("show_map",), "log": ("show_log",),
+                  "all": ("show_ai", "show_map", "show_log"), "braille": ("braille",)}
+def percentile(sorted_vals, p):
+    # nearest-rank percentile of an already sorted list
+    if not sorted_vals: return 0.0
+    k = max(0, min(len(sorted_vals) - 1, int(math.ceil(p / 100.0 * len(sorted_vals))) - 1))
+    return sorted_vals[k]
+def bench_case(density, size, overlay, frames, engine="auto", warmup=20, alloc_frames=50, seed=1234, pilot=None,
+               backend="null"):
+    """
+    Time `frames` full frames (sim tick + compose + present) of one configuration and
+    return frame-time percentiles, output volume and per-frame allocation figures. With a
+    `pilot` the ship flies the mission, so scrolling and HUD changes are exercised too.
+    The "ansi" backend builds real escape-sequence frames and writes them to os.devnull.
+    """
+    w, h = size
+    sim = Voyage(w, h, DEFAULT_SPEED, density, engine, seed=seed)
+    if backend == "ansi":
+        out_fd = os.open(os.devnull, os.O_WRONLY)
+        out = AnsiBackend(out_fd, interactive=False)
+    else:
+        out_fd, out = None, NullBackend(h, w)
+    buf = FrameBuffer(h, w)
+    layers = LayerCache()
+    flags = BENCH_OVERLAYS[overlay]
+    # one rendered frame covers SIM_HZ/FPS fixed simulation ticks, as in run()
+    dt = 1.0 / SIM_HZ
+    ticks = max(1, int(round(SIM_HZ / FPS)))
+    driver = PILOTS[pilot]() if pilot else None
+    every = max(1, int(round(SIM_HZ / PILOT_HZ)))
+    tick_no = itertools.count()
+    def frame():
+        for f in flags: setattr(sim, f, True)
+        for _ in range(ticks):
+            k = driver(sim) if driver and next(tick_no) % every == 0 else None
+            sim.tick(dt, (k,) if k is not None else ())
+        sim.pop_events()
+        buf.erase()
+        draw_frame(buf, sim, layers=layers)
+        out.present(buf)
+    for _ in range(warmup): frame()
+    counters = ("writes", "bytes_written") if backend == "ansi" else ("calls", "chars")
+    for c in counters: setattr(out, c, 0)
+    times = []
+    blocks0 = sys.getallocatedblocks()
+    clock = time.perf_counter
+    for _ in range(frames):
+        t0 = clock()
+        frame()
+        times.append(clock() - t0)
+    blocks1 = sys.getallocatedblocks()
+    calls, chars = (getattr(out, c) for c in counters)
+    # separate, shorter pass under tracemalloc: its overhead would distort the timings above
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(alloc_frames, frames)):
+            if hasattr(tracemalloc, "reset_peak"): tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            frame()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+        if out_fd is not None: os.close(out_fd)
+    total = sum(times)
+    times.sort()
+    ms = lambda v: round(v * 1000.0, 3)
+    return {
+        "density": density, "size": f"{w}x{h}", "overlay": overlay, "pilot": pilot, "backend": backend,
+        "engine": type(sim.stars).__name__, "frames": frames,
+        "fps": round(frames / total, 1) if total > 0 else None,
+        "frame_ms": {"mean": ms(total / frames), "p50": ms(percentile(times, 50)),
+                     "p95": ms(percentile(times, 95)), "p99": ms(percentile(times, 99)), "max": ms(times[-1])},
+        "within_budget": percentile(times, 95) <= 1.0 / FPS,
+        # null backend: changed runs and characters; ansi backend: write() calls and bytes
+        "draw_calls_per_frame": round(calls / frames, 1),
+        "chars_per_frame": round(chars / frames, 1),
+        "alloc_peak_kib_per_frame": round(sum(peaks) / len(peaks) / 1024.0, 2) if peaks else None,
+        "net_blocks_per_frame": round((blocks1 - blocks0) / frames, 2),
+    }
+def run_benchmarks(densities, sizes, overlays, frames, engine="auto", log=None, pilot=None, backend="null"):
+    results = []
+    for density in densities:
+        for size in sizes:
+            for overlay in overlays:
+                r = bench_case(density, size, overlay, frames, engine, pilot=pilot, backend=backend)
+                results.append(r)
+                if log:
+                    log.write(f"{r['engine']:>15} density={density:<6} size={r['size']:<8} overlay={overlay:<5} "
+                              f"fps={r['fps']:<8} p50={r['frame_ms']['p50']}ms p95={r['frame_ms']['p95']}ms "
+                              f"p99={r['frame_ms']['p99']}ms alloc={r['alloc_peak_kib_per_frame']}KiB\n")
+                    log.flush()
+    return {
+        "benchmark": "voyager-frame-time", "version": 1,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0], "numpy": np.__version__ if load_numpy() else None,
+        "target_fps": FPS, "results": results,
+    }
+
 # Entrypoint
 def main():
     parser = argparse.ArgumentParser(prog="voyage_starfield_odyssey")
     parser.add_argument("--speed", type=float, default=DEFAULT_SPEED)
     parser.add_argument("--density", type=int, default=STAR_DENSITY)
+    parser.add_argument("--backend", choices=BACKENDS, default="curses",
+                        help="terminal output: curses, or raw ANSI with one buffered write per frame")
+    parser.add_argument("--engine", choices=["auto","numpy","python"], default="auto",
+                        help="starfield engine: vectorized NumPy arrays or per-object Star stepping")
+    parser.add_argument("--braille", action="store_true",
+                        help="draw stars as Braille dots (2x4 per cell) instead of one glyph per star; B toggles")
+    parser.add_argument("--fixed-density", action="store_true",
+                        help="keep --density fixed instead of adapting detail to hold the frame rate")
+    parser.add_argument("--tick-hz", type=float, default=SIM_HZ, help="fixed simulation ticks per second")
+    parser.add_argument("--render-hz", type=float, default=FPS, help="maximum rendered frames per second")
+    parser.add_argument("--profile", nargs="?", const="profile_report.json", default=None, metavar="PATH",
+                        help="time each loop phase and write the histograms to PATH on exit (F toggles the overlay)")
+    parser.add_argument("--event-log", default=None, metavar="PATH",
+                        help="append session events as JSONL (default mission_events.jsonl; headless: off)")
+    parser.add_argument("--no-event-log", action="store_true", help="do not write the event log")
+    parser.add_argument("--rebuild-report", metavar="LOG", help="rebuild mission_report.json from an event log and exit")
+    parser.add_argument("--seed", type=int, default=None, help="seed the universe, missions and starfield")
+    parser.add_argument("--record", metavar="PATH", help="record the seed and every input to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recording made with --record")
+    parser.add_argument("--fast", action="store_true", help="replay: fast-forward without rendering and verify the score")
+    parser.add_argument("--resume", nargs="?", const=SNAP_PATH, default=None, metavar="PATH",
+                        help=f"continue the voyage saved in a snapshot (default {SNAP_PATH})")
+    parser.add_argument("--snapshot", default=None, metavar="PATH",
+                        help=f"where the session is autosaved (default: the --resume file, else {SNAP_PATH})")
+    parser.add_argument("--autosave", type=float, default=SNAP_EVERY, metavar="SECONDS",
+                        help="seconds of play between snapshots (0: only on exit)")
+    parser.add_argument("--no-snapshot", action="store_true", help="do not write session snapshots")
+    parser.add_argument("--broadcast", nargs="?", const=SPECTATOR_SOCKET, default=None, metavar="SOCKET",
+                        help=f"publish frames to spectators on a Unix socket (default {SPECTATOR_SOCKET})")
+    parser.add_argument("--spectate", nargs="?", const=SPECTATOR_SOCKET, default=None, metavar="SOCKET",
+                        help="watch a --broadcast session read-only (Q leaves)")
+    parser.add_argument("--skip-intro", action="store_true",
+                        help="start flying straight away: no mission brief splash or entering pause (kiosks)")
+    parser.add_argument("--startup-trace", nargs="?", const="-", default=None, metavar="PATH",
+                        help="time startup up to the first game frame; print the phases on exit or write JSON to PATH")
+    parser.add_argument("--headless", action="store_true", help="run the simulation without a terminal")
+    parser.add_argument("--frames", type=int, default=1000, help="headless: number of frames to simulate")
+    parser.add_argument("--dt", type=float, default=1.0/SIM_HZ, help="headless: fixed seconds per frame")
+    parser.add_argument("--size", type=parse_size, default=(120, 40), help="headless: virtual terminal WxH")
+    parser.add_argument("--keys", default="", help="headless: scripted input, one key per frame ('.' = none)")
+    parser.add_argument("--render", action="store_true", help="headless: also draw every frame (into a null backend)")
+    parser.add_argument("--pilot", choices=sorted(PILOTS), default=None,
+                        help="fly headless runs, benchmarks and batch voyages with a built-in pilot (batch default: auto)")
+    parser.add_argument("--batch", type=int, metavar="N", help="run N piloted voyages in parallel and print statistics")
+    parser.add_argument("--batch-workers", type=int, default=None, help="batch: worker processes (default: all cores)")
+    parser.add_argument("--batch-seconds", type=float, default=600.0, help="batch: sim seconds per voyage")
+    parser.add_argument("--batch-out", default="-", help="batch: JSON results file ('-' = stdout)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="NAME=VALUE",
+                        help="batch: override a balance constant, e.g. --set WARP_FUEL_MULT=5 (repeatable)")
+    parser.add_argument("--aggregate", nargs="+", metavar="PATH",
+                        help="aggregate mission reports (files or directories, .json or .txt) and print statistics")
+    parser.add_argument("--aggregate-workers", type=int, default=None, help="aggregate: parser processes (default: all cores)")
+    parser.add_argument("--aggregate-cache", default="report_cache.json", metavar="PATH",
+                        help="aggregate: per-file summary cache for incremental reruns ('' = none)")
+    parser.add_argument("--aggregate-out", default="-", help="aggregate: JSON results file ('-' = stdout)")
+    parser.add_argument("--bench", action="store_true", help="run the frame-time benchmark sweep and exit")
+    parser.add_argument("--bench-density", default="160,2000,20000", help="bench: comma-separated star densities")
+    parser.add_argument("--bench-sizes", default="80x24,120x40,200x60", help="bench: comma-separated WxH sizes")
+    parser.add_argument("--bench-overlays", default="none,all", help="bench: any of " + ",".join(BENCH_OVERLAYS))
+    parser.add_argument("--bench-frames", type=int, default=300, help="bench: timed frames per case")
+    parser.add_argument("--bench-out", default="-", help="bench: JSON results file ('-' = stdout)")
+    parser.add_argument("--bench-backend", choices=["null", "ansi"], default="null",
+                        help="bench: discard frames after diffing, or build ANSI output and write it to os.devnull")
     args = parser.parse_args()
+    trace = StartupTrace() if args.startup_trace else NULL_TRACE
+    trace.mark("imports")
+    if args.engine == "numpy" and load_numpy() is None:
+        parser.error("--engine numpy requires NumPy (pip install numpy)")
+    if args.seed is not None and not -2**63 <= args.seed < 2**63:
+        parser.error("--seed must fit in a signed 64-bit integer")
+    if args.tick_hz <= 0 or args.render_hz <= 0:
+        parser.error("--tick-hz and --render-hz must be positive")
+    if args.rebuild_report:
+        try:
+            report = rebuild_report(args.rebuild_report)
+        except OSError as e:
+            parser.error(f"cannot read {args.rebuild_report}: {e}")
+        print(json.dumps(report, indent=2, ensure_ascii=False) if report else "No session found in log.")
+        return
+    if args.no_event_log:
+        args.event_log = None
+    elif args.event_log is None and not (args.headless or args.replay):
+        # replays would duplicate the recorded session in the default log
+        args.event_log = "mission_events.jsonl"
+    if args.fast and not args.replay:
+        parser.error("--fast needs --replay PATH")
+    if args.resume and (args.replay or args.record):
+        parser.error("--resume cannot be combined with --replay or --record")
+    replay = None
+    if args.replay:
+        # checked here for both paths: the interactive one would only fail once the terminal is up
+        try:
+            replay = Replay(args.replay)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            parser.error(f"cannot replay {args.replay}: {e}")
+    if replay and args.fast:
+        summary = replay_headless(replay, args.engine, args.event_log)
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return
+    if args.aggregate:
+        results = aggregate_reports(args.aggregate, args.aggregate_workers, args.aggregate_cache or None, log=sys.stderr)
+        if args.aggregate_out == "-":
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        else:
+            with open(args.aggregate_out, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+        return
+    if args.batch:
+        try:
+            overrides = dict(parse_override(o) for o in args.overrides)
+        except ValueError as e:
+            parser.error(f"--set: {e}")
+        results = run_batch(args.batch, args.seed or 0, args.batch_workers, args.batch_seconds, args.dt,
+                            args.size, overrides, args.pilot or "auto", log=sys.stderr)
+        if args.batch_out == "-":
+            print(json.dumps(results, indent=2))
+        else:
+            with open(args.batch_out, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        return
+    if args.bench:
+        try:
+            densities = [int(d) for d in args.bench_density.split(",")]
+            sizes = [parse_size(z) for z in args.bench_sizes.split(",")]
+        except ValueError as e:
+            parser.error(f"bad --bench-density/--bench-sizes: {e}")
+        overlays = args.bench_overlays.split(",")
+        for o in overlays:
+            if o not in BENCH_OVERLAYS:
+                parser.error(f"unknown overlay {o!r}; choose from {', '.join(BENCH_OVERLAYS)}")
+        results = run_benchmarks(densities, sizes, overlays, max(1, args.bench_frames), args.engine, log=sys.stderr,
+                                 pilot=args.pilot, backend=args.bench_backend)
+        if args.bench_out == "-":
+            print(json.dumps(results, indent=2))
+        else:
+            with open(args.bench_out, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        return
+    if args.headless:
+        summary = run_headless(args.frames, args.dt, args.size, args.keys, args.speed, args.density, args.engine,
+                               args.event_log, args.seed, args.record, args.pilot, args.render)
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return
+    if (args.broadcast or args.spectate) and not hasattr(asyncio, "start_unix_server"):
+        parser.error("--broadcast/--spectate need Unix domain sockets, which this platform lacks")
+    if args.spectate and not os.path.exists(args.spectate):
+        parser.error(f"no broadcast at {args.spectate} (start the game with --broadcast)")
+    locale.setlocale(locale.LC_ALL, '')
+    if args.engine != "python" and not args.spectate: preload_numpy(trace)
+    resume = None
+    if args.resume:
+        # parsed and checked here; the voyage itself is rebuilt behind the first frame
+        try:
+            resume = read_snapshot(args.resume)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot resume from {args.resume}: {e}")
+    snapshot = None if args.no_snapshot or args.replay else args.snapshot or args.resume or SNAP_PATH
+    trace.mark("setup")
     try:
-        curses.wrapper(run, args.speed, args.density)
+        run_args = (args.speed, args.density, args.engine, args.profile, args.tick_hz, args.render_hz,
+                    args.event_log, args.seed, args.record, replay, not args.fixed_density, args.braille,
+                    resume, snapshot, args.autosave, args.broadcast, not args.skip_intro, trace)
+        play = (lambda b: spectate(b, args.spectate)) if args.spectate else (lambda b: run(b, *run_args))
+        if args.backend == "ansi":
+            with AnsiBackend() as backend:
+                play(backend)
+        else:
+            curses.wrapper(lambda stdscr: play(CursesBackend(stdscr)))
+        if args.startup_trace == "-":
+            trace.write(sys.stderr)
+        elif args.startup_trace:
+            with open(args.startup_trace, "w", encoding="utf-8") as f:
+                json.dump(trace.summary(), f, indent=2)
     except KeyboardInterrupt:
         try:
             curses.endwin()